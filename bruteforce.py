@@ -9,6 +9,9 @@ import time
 import numpy as np
 import pandas as pd
 from itertools import combinations
+import kernels
+from itemset_trie import ItemsetTrie
+from transactions import load_transactions
 
 def convert_to_freq_dict(transactions):
     freq_dict = {}
@@ -25,64 +28,81 @@ def read_transactions_from_csv(file_path):
         print("File not found. Please provide a valid file path.")
         return None
 
-def load_transactions(dataList):
-    Transactions = []
-    df_items = dataList['TransactionList']
-    comma_splitted_df = df_items.apply(lambda x: x.split(','))
-    for i in comma_splitted_df:
-        Transactions.append(i)
-    return Transactions
-
-def generate_frequent_itemsets_brute_force(transactions, min_support):
-    itemsets = set()
+def generate_frequent_itemsets_brute_force(transactions, min_support, min_length=1, max_length=None, required=frozenset(), excluded=frozenset(), support=None):
+    # The constraints only decide which itemsets are returned. Pass an
+    # ItemsetTrie as support to get the support of every returned itemset and
+    # of all their subsets, for generate_association_rules(..., support).
+    items = set()
     for transaction in transactions:
         for item in transaction:
-            itemsets.add(frozenset([item]))
+            items.add(item)
 
-    frequent_itemsets = {}
+    frequent_itemsets = ItemsetTrie()
+    if not required.issubset(items) or required.intersection(excluded):
+        return frequent_itemsets
+    # Every k-itemset is tested, but only those holding all required items are
+    # generated, and a level without a frequent itemset ends the search.
+    optional_items = sorted(items - required - excluded)
     total_transactions = len(transactions)
-    for itemset in itemsets:
-        count = 0
-        for transaction in transactions:
-            if itemset.issubset(transaction):
-                count += 1
-        support = count / total_transactions
-        if support >= min_support:
-            frequent_itemsets[itemset] = support
+    k = max(len(required), 1)
+    while max_length is None or k <= max_length:
+        found = False
+        level = [required.union(extra) for extra in combinations(optional_items, k - len(required))]
+        for itemset, count in zip(level, kernels.count_subsets(transactions, level)):
+            itemset_support = count / total_transactions
+            if itemset_support >= min_support:
+                found = True
+                if k >= min_length:
+                    frequent_itemsets[itemset] = itemset_support
+                if support is not None:
+                    support[itemset] = itemset_support
+        if not found:
+            break
+        k += 1
 
+    if support is not None:
+        # Subsets without the required items were never generated.
+        missing = set()
+        for itemset in frequent_itemsets.keys():
+            for size in range(1, len(itemset)):
+                for subset in combinations(itemset, size):
+                    if subset not in support:
+                        missing.add(subset)
+        missing = list(missing)
+        for itemset, count in zip(missing, kernels.count_subsets(transactions, missing)):
+            support[itemset] = count / total_transactions
     return frequent_itemsets
 
-def generate_association_rules(frequent_itemsets, min_confidence):
+def generate_association_rules(frequent_itemsets, min_confidence, support=None):
+    # Antecedent supports come from support when given, else from
+    # frequent_itemsets.
+    if support is None:
+        support = frequent_itemsets
     association_rules = []
     for itemset in frequent_itemsets.keys():
         if len(itemset) > 1:
-            rules_from_itemset = generate_rules_from_itemset(itemset, frequent_itemsets, min_confidence)
+            rules_from_itemset = generate_rules_from_itemset(itemset, frequent_itemsets, min_confidence, support)
             association_rules.extend(rules_from_itemset)
     return association_rules
 
-def generate_rules_from_itemset(itemset, frequent_itemsets, min_confidence):
+def generate_rules_from_itemset(itemset, frequent_itemsets, min_confidence, support=None):
+    if support is None:
+        support = frequent_itemsets
     rules = []
-    subsets = get_subsets(itemset)
-    for subset in subsets:
-        remaining = tuple(set(itemset).difference(subset))
+    itemset_support = frequent_itemsets[itemset]
+    for subset, subset_support in support.subsets(itemset):
+        remaining = tuple(sorted(set(itemset).difference(subset)))
         
         if len(subset) > 0 and len(remaining) > 0:
-            subset_support = frequent_itemsets.get(subset, 0)
-            if subset_support == 0:
-                continue
-            
-            confidence = frequent_itemsets[itemset] / subset_support
+            confidence = itemset_support / subset_support
             
             if confidence >= min_confidence:
                 rules.append((subset, remaining, confidence))
     
     return rules
 
-def get_subsets(itemset):
-    subsets = []
-    for i in range(1, len(itemset)):
-        subsets.extend(combinations(itemset, i))
-    return subsets
+def parse_items(text):
+    return frozenset(item.strip() for item in text.split(',') if item.strip())
 
 if __name__ == '__main__':
     print("Welcome to the Brute Force Association Rule Mining Algorithm.")
@@ -111,6 +131,10 @@ if __name__ == '__main__':
     # Minimum Support and Confidence Input
     minsupport = float(input("Enter the Minimum Support (in percentage): ")) / 100
     minconfidence = float(input("Enter the Minimum Confidence (in percentage): ")) / 100
+    min_length = int(input("Enter the Minimum Itemset Length (leave blank for 1): ") or 1)
+    max_length = int(input("Enter the Maximum Itemset Length (leave blank for no limit): ") or 0) or None
+    required = parse_items(input("Enter items every itemset must contain (comma separated, leave blank for none): "))
+    excluded = parse_items(input("Enter items to exclude (comma separated, leave blank for none): "))
     
     # Data Processing and Analysis
     dataList = read_transactions_from_csv(file_path)
@@ -122,9 +146,10 @@ if __name__ == '__main__':
     
     start_time = time.time()
     
-    frequent_itemsets = generate_frequent_itemsets_brute_force(Transactions, minsupport)
+    support = ItemsetTrie()
+    frequent_itemsets = generate_frequent_itemsets_brute_force(Transactions, minsupport, min_length, max_length, required, excluded, support)
     
-    association_rules = generate_association_rules(frequent_itemsets, minconfidence)
+    association_rules = generate_association_rules(frequent_itemsets, minconfidence, support)
     
     # Output Display
     print("\nFrequent itemsets found with Brute Force algorithm:")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Differential check of every miner. Each engine runs on the bundled datasets
+# and on generated ones; their itemset -> count results and rule sets must be
+# identical, and their runtimes must stay within TOLERANCE of the baselines in
+# miner_baselines.json. Run with --update-baselines to record new timings.
+# Constrained runs (length limits, required items) are compared with Apriori.
+
+import os
+import sys
+import json
+import time
+import random
+
+from thefp import read_transactions_from_csv, generate_association_rules
+from transactions import load_transactions
+from theauto import run_engine, load_apriori, to_counts, ENGINES
+from thepfp import pfp_growth, ProcessTransport
+from thefp import convert_to_freq_dict, fp_growth
+from bruteforce import generate_frequent_itemsets_brute_force
+from itemset_trie import ItemsetTrie
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'miner_baselines.json')
+TOLERANCE = 1.5
+SLACK_SECONDS = 0.02
+REPEATS = 3
+
+BUNDLED = ['Nike.csv', 'Kmart - Sheet1.csv', 'Cars_List.csv', 'Games_Transaction_List.csv', 'Costco.csv']
+
+
+def generated_datasets():
+    # Small enough for brute force: at most 12 items and 300 baskets. Each
+    # basket is one of a few planted patterns plus random noise, so there are
+    # rules to compare and not only frequent items.
+    datasets = {}
+    for seed, (baskets, items, length) in enumerate([(300, 10, 4), (300, 12, 6), (200, 8, 7), (300, 12, 2)]):
+        rng = random.Random(seed)
+        names = [f"item{i}" for i in range(items)]
+        patterns = [rng.sample(names, rng.randint(2, 4)) for _ in range(3)]
+        datasets[f"generated-{seed}"] = [
+            list(dict.fromkeys(rng.choice(patterns) + rng.sample(names, rng.randint(0, length))))
+            for _ in range(baskets)]
+    return datasets
+
+def timed_datasets():
+    # Sized for the timing check: every engine takes well over SLACK_SECONDS,
+    # so a slowdown shows against the baseline. Too large for brute force,
+    # which is left out. Planted patterns plus noise as in generated_datasets,
+    # over many sparse items, few dense ones, and long patterns.
+    datasets = {}
+    for seed, (baskets, items, length, patterns, shortest, longest) in enumerate(
+            [(100000, 200, 6, 4, 2, 4), (15000, 30, 10, 3, 3, 6), (120000, 50, 3, 5, 3, 6)]):
+        rng = random.Random(100 + seed)
+        names = [f"item{i}" for i in range(items)]
+        planted = [rng.sample(names, rng.randint(shortest, longest)) for _ in range(patterns)]
+        datasets[f"timed-{seed}"] = [
+            list(dict.fromkeys(rng.choice(planted) + rng.sample(names, rng.randint(0, length))))
+            for _ in range(baskets)]
+    return datasets
+
+def mine(engine, transactions, min_support):
+    if engine == 'pfp':
+        return pfp_growth(convert_to_freq_dict(transactions), min_support * len(transactions), 3, ProcessTransport(2))
+    return run_engine(engine, transactions, min_support)
+
+def rule_set(frequent_itemsets, min_confidence, support=None):
+    return {(frozenset(a), frozenset(c), round(conf, 9))
+            for a, c, conf in generate_association_rules(frequent_itemsets, min_confidence, support)}
+
+def apriori_rule_set(transactions, min_support, min_confidence):
+    # Apriori derives its rules on its own, so they are compared too.
+    apriori = load_apriori()
+    freq, support = apriori.calculate_frequency_support(transactions, min_support)
+    return {(frozenset(x[0].left), frozenset(x[0].right), round(x[2], 9))
+            for x in apriori.EvaluateAssociationRules(freq, support, min_confidence)}
+
+def check(datasets, engines, min_support, min_confidence, baselines, update):
+    failures = []
+    timings = {}
+    for name, transactions in datasets.items():
+        results = {}
+        for engine in engines:
+            best = None
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                results[engine] = mine(engine, transactions, min_support)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            key = f"{name}|{engine}|{min_support}"
+            timings[key] = best
+            if not update and key in baselines and best > baselines[key] * TOLERANCE + SLACK_SECONDS:
+                failures.append(f"{key}: {best:.4f}s against a baseline of {baselines[key]:.4f}s")
+        reference_engine = engines[0]
+        reference = dict(results[reference_engine].items())
+        reference_rules = rule_set(results[reference_engine], min_confidence)
+        for engine in engines[1:]:
+            got = dict(results[engine].items())
+            if got != reference:
+                diff = set(got.items()) ^ set(reference.items())
+                failures.append(f"{name}: {engine} itemsets differ from {reference_engine} on {len(diff)} entries, e.g. {sorted(diff, key=str)[:3]}")
+            elif rule_set(results[engine], min_confidence) != reference_rules:
+                failures.append(f"{name}: {engine} rules differ from {reference_engine}")
+        if 'apriori' in engines and apriori_rule_set(transactions, min_support, min_confidence) != reference_rules:
+            failures.append(f"{name}: EvaluateAssociationRules differs from generate_association_rules")
+        print(f"{name}: {len(reference)} itemsets, {len(reference_rules)} rules checked across {len(engines)} engines")
+    return failures, timings
+
+def constraints(transactions):
+    # A minimum length, the most common item as a required item, and both
+    # with a maximum length.
+    counts = {}
+    for transaction in transactions:
+        for item in transaction:
+            counts[item] = counts.get(item, 0) + 1
+    common = frozenset([max(sorted(counts), key=counts.get)])
+    return [{'min_length': 2}, {'required': common}, {'min_length': 2, 'max_length': 3, 'required': common}]
+
+def check_constrained(datasets, min_support, min_confidence):
+    # The engines that take length and required-item constraints must return
+    # the same itemsets and, with their side store of supports, the same rules
+    # as Apriori, which filters its levels only after counting.
+    failures = []
+    apriori = load_apriori()
+    for name, transactions in datasets.items():
+        total = len(transactions)
+        for options in constraints(transactions):
+            freq, support = apriori.calculate_frequency_support(transactions, min_support, **options)
+            reference = to_counts({fs: support[fs] for level in freq for fs in level}, total)
+            reference_rules = {(frozenset(x[0].left), frozenset(x[0].right), round(x[2], 9))
+                               for x in apriori.EvaluateAssociationRules(freq, support, min_confidence)}
+            fp_support = ItemsetTrie('q')
+            fp = fp_growth(convert_to_freq_dict(transactions), min_support * total, support=fp_support, **options)
+            brute_support = ItemsetTrie()
+            brute = generate_frequent_itemsets_brute_force(transactions, min_support, support=brute_support, **options)
+            for engine, found, found_rules in [
+                    ('fpgrowth', dict(fp.items()), rule_set(fp, min_confidence, fp_support)),
+                    ('bruteforce', dict(to_counts(brute, total).items()), rule_set(brute, min_confidence, brute_support))]:
+                if found != dict(reference.items()):
+                    failures.append(f"{name} {options}: {engine} itemsets differ from apriori")
+                elif found_rules != reference_rules:
+                    failures.append(f"{name} {options}: {engine} rules differ from apriori "
+                                    f"({len(found_rules)} against {len(reference_rules)})")
+        print(f"{name}: {len(constraints(transactions))} constrained runs checked")
+    return failures
+
+
+if __name__ == '__main__':
+    update = '--update-baselines' in sys.argv
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+
+    datasets = {path: load_transactions(read_transactions_from_csv(path)) for path in BUNDLED}
+    datasets.update(generated_datasets())
+    engines = list(ENGINES) + ['pfp']
+
+    timed = timed_datasets()
+    timed_engines = [engine for engine in engines if engine != 'bruteforce']
+
+    failures, timings = [], {}
+    for min_support, min_confidence in [(0.1, 0.5), (0.25, 0.7)]:
+        found, measured = check(datasets, engines, min_support, min_confidence, baselines, update)
+        failures.extend(found)
+        timings.update(measured)
+        failures.extend(check_constrained(datasets, min_support, min_confidence))
+        found, measured = check(timed, timed_engines, min_support, min_confidence, baselines, update)
+        failures.extend(found)
+        timings.update(measured)
+
+    if update:
+        with open(BASELINES, 'w') as f:
+            json.dump(timings, f, indent=1, sort_keys=True)
+        print(f"Baselines written to {BASELINES}")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(failure)
+        sys.exit(1)
+    print("\nAll miners agree" + ("" if update else " and no timing regressions were found"))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import sys
+import time
+
+from thefp import (read_transactions_from_csv, load_transactions, convert_to_freq_dict, construct_fp_tree,
+                   save_fp_tree, load_fp_tree, mine_fp_tree, generate_association_rules)
+
+
+if __name__ == '__main__':
+    print("Welcome to the FP-tree cache.")
+    print("1. Build an FP-tree from a dataset and save it")
+    print("2. Mine a saved FP-tree")
+
+    while True:
+        mode = input("Enter your choice: ")
+        if mode in ('1', '2'):
+            break
+        print("Invalid choice. Please enter 1 or 2.")
+
+    if mode == '1':
+        print("Please choose the dataset you want:")
+        datasets = {
+            '1': 'Nike.csv',
+            '2': 'Kmart - Sheet1.csv',
+            '3': 'Cars_List.csv',
+            '4': 'Games_Transaction_List.csv',
+            '5': 'Costco.csv'
+        }
+        while True:
+            choice_of_data = input("Enter your choice: ")
+            if choice_of_data in datasets:
+                file_path = datasets[choice_of_data]
+                print(f"User chose {file_path} dataset")
+                break
+            else:
+                print("Invalid choice. Please enter the number corresponding to the dataset.")
+
+        dataList = read_transactions_from_csv(file_path)
+        if dataList is None:
+            sys.exit(1)
+
+        floor = float(input("Enter the lowest Minimum Support you will mine at (in percentage): ")) / 100
+        tree_path = input("Enter the file to save the FP-tree to: ") or file_path.replace('.csv', '.fptree.npz')
+
+        start_time = time.time()
+        Transactions = load_transactions(dataList)
+        min_count = floor * len(Transactions)
+        tree, header_table = construct_fp_tree(convert_to_freq_dict(Transactions), min_count)
+        save_fp_tree(tree_path, tree, header_table, min_count, len(Transactions))
+        end_time = time.time()
+
+        print(f"Saved the FP-tree of {len(Transactions)} transactions to {tree_path}")
+    else:
+        tree_path = input("Enter the saved FP-tree file: ")
+        minsupport = float(input("Enter the Minimum Support (in percentage): ")) / 100
+        minconfidence = float(input("Enter the Minimum Confidence (in percentage): ")) / 100
+
+        start_time = time.time()
+        try:
+            tree, header_table, floor, total = load_fp_tree(tree_path)
+        except FileNotFoundError:
+            print("File not found. Please provide a valid file path.")
+            sys.exit(1)
+        try:
+            frequent_itemsets = mine_fp_tree(header_table, floor, minsupport * total)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        association_rules = generate_association_rules(frequent_itemsets, minconfidence)
+        end_time = time.time()
+
+        print("\nFrequent itemsets found in the saved FP-tree:")
+        for itemset, support in frequent_itemsets.items():
+            print(f"Itemset: {itemset}, Support: {support}")
+
+        print("\nAssociation rules found in the saved FP-tree:")
+        for rule in association_rules:
+            antecedent = ', '.join(rule[0])
+            consequent = ', '.join(rule[1])
+            confidence = rule[2]
+            print(f"Rule: {antecedent} -> {consequent}, Confidence: {confidence}")
+
+    print("-------------------------- RUNNING TIME:------------------------------------")
+    print("The Runtime of the program is: " + str(end_time - start_time) + "seconds")
+
+    print("---------------------------------------------------------------------------\n")
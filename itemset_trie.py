@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+from array import array
+from collections.abc import MutableMapping
+
+import numpy as np
+
+
+class ItemsetTrie(MutableMapping):
+    # Prefix trie of itemsets stored in flat arrays. Items are mapped to ids and
+    # every itemset is stored along its ids in ascending order, so an itemset
+    # shares its nodes with all its stored prefixes and any iterable of items
+    # (tuple, list, frozenset) in any order finds the same node in O(k).
+    # Keys come back as tuples sorted by item.
+    #
+    # Children are found through an open-addressing table of node ids, probed
+    # linearly from a hash of (parent, item). A slot holds only the child id
+    # and is matched against the parent and node_item arrays, so a node costs
+    # 33-41 bytes in all with 8-byte supports.
+    def __init__(self, typecode='d'):
+        self.typecode = typecode
+        self.item_ids = {}
+        self.items_list = []
+        self.node_item = array('i', [-1])
+        self.parent = array('i', [-1])
+        self.first_child = array('i', [-1])
+        self.next_sibling = array('i', [-1])
+        self.support = array(typecode, [0])
+        self.has_support = bytearray(1)
+        self.table = array('i', [-1]) * 8
+        self.size = 0
+
+    def _ids(self, itemset, create=False):
+        ids = []
+        for item in itemset:
+            i = self.item_ids.get(item)
+            if i is None:
+                if not create:
+                    return None
+                i = self.item_ids[item] = len(self.items_list)
+                self.items_list.append(item)
+            ids.append(i)
+        ids.sort()
+        return ids
+
+    def _slot(self, node, i):
+        # The slot holding the child of node for item id i, or the empty slot
+        # where it belongs.
+        table, node_item, parent = self.table, self.node_item, self.parent
+        mask = len(table) - 1
+        slot = (node * 0x9E3779B1 + i * 0x85EBCA77) & mask
+        child = table[slot]
+        while child != -1 and (node_item[child] != i or parent[child] != node):
+            slot = (slot + 1) & mask
+            child = table[slot]
+        return slot
+
+    def _child(self, node, i):
+        child = self.table[self._slot(node, i)]
+        return None if child == -1 else child
+
+    def _find(self, itemset):
+        ids = self._ids(itemset)
+        if ids is None:
+            return None
+        node = 0
+        for i in ids:
+            node = self._child(node, i)
+            if node is None:
+                return None
+        return node
+
+    def _add_child(self, node, i, slot=None):
+        child = len(self.node_item)
+        self.node_item.append(i)
+        self.parent.append(node)
+        self.first_child.append(-1)
+        self.next_sibling.append(self.first_child[node])
+        self.first_child[node] = child
+        self.support.append(0)
+        self.has_support.append(0)
+        if 2 * len(self.node_item) > len(self.table):
+            # Kept at most half full; growing re-inserts every node.
+            self.table = array('i', [-1]) * (2 * len(self.table))
+            for other in range(1, len(self.node_item)):
+                self.table[self._slot(self.parent[other], self.node_item[other])] = other
+        else:
+            self.table[self._slot(node, i) if slot is None else slot] = child
+        return child
+
+    def _key(self, ids):
+        return tuple(sorted(self.items_list[i] for i in ids))
+
+    def _walk(self, node, path):
+        child = self.first_child[node]
+        while child != -1:
+            path.append(self.node_item[child])
+            if self.has_support[child]:
+                yield child, path
+            yield from self._walk(child, path)
+            path.pop()
+            child = self.next_sibling[child]
+
+    def __setitem__(self, itemset, support):
+        node = 0
+        for i in self._ids(itemset, create=True):
+            slot = self._slot(node, i)
+            child = self.table[slot]
+            node = self._add_child(node, i, slot) if child == -1 else child
+        if not self.has_support[node]:
+            self.has_support[node] = 1
+            self.size += 1
+        self.support[node] = support
+
+    def __getitem__(self, itemset):
+        node = self._find(itemset)
+        if node is None or not self.has_support[node]:
+            raise KeyError(itemset)
+        return self.support[node]
+
+    def __delitem__(self, itemset):
+        node = self._find(itemset)
+        if node is None or not self.has_support[node]:
+            raise KeyError(itemset)
+        self.has_support[node] = 0
+        self.size -= 1
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for node, path in self._walk(0, []):
+            yield self._key(path)
+
+    def items(self):
+        for node, path in self._walk(0, []):
+            yield self._key(path), self.support[node]
+
+    def __repr__(self):
+        return 'ItemsetTrie(%d itemsets)' % self.size
+
+    def subsets(self, itemset):
+        # Stored subsets of itemset (itemset included), visiting only branches
+        # whose items all belong to it.
+        ids = self._ids(item for item in itemset if item in self.item_ids)
+        stack = [(0, 0, ())]
+        while stack:
+            node, start, path = stack.pop()
+            for pos in range(start, len(ids)):
+                child = self._child(node, ids[pos])
+                if child is None:
+                    continue
+                child_path = path + (ids[pos],)
+                if self.has_support[child]:
+                    yield self._key(child_path), self.support[child]
+                stack.append((child, pos + 1, child_path))
+
+    def supersets(self, itemset):
+        # Stored supersets of itemset. Ids along a path ascend, so a branch is
+        # abandoned once it passes the next id still to be matched.
+        ids = self._ids(itemset)
+        if ids is None:
+            return
+        stack = [(0, 0, ())]
+        while stack:
+            node, matched, path = stack.pop()
+            child = self.first_child[node]
+            while child != -1:
+                i = self.node_item[child]
+                child_matched = matched
+                if matched < len(ids) and i == ids[matched]:
+                    child_matched += 1
+                if matched == len(ids) or i <= ids[matched]:
+                    child_path = path + (i,)
+                    if child_matched == len(ids) and self.has_support[child]:
+                        yield self._key(child_path), self.support[child]
+                    stack.append((child, child_matched, child_path))
+                child = self.next_sibling[child]
+
+    def save(self, path):
+        np.savez_compressed(path,
+                            items=np.array(json.dumps(self.items_list)),
+                            typecode=np.array(self.typecode),
+                            node_item=np.frombuffer(self.node_item, dtype=np.int32),
+                            parent=np.frombuffer(self.parent, dtype=np.int32),
+                            support=np.array(self.support),
+                            has_support=np.frombuffer(bytes(self.has_support), dtype=np.uint8))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            trie = cls(str(data['typecode']))
+            trie.items_list = json.loads(str(data['items']))
+            trie.item_ids = {item: i for i, item in enumerate(trie.items_list)}
+            node_item = data['node_item'].tolist()
+            parent = data['parent'].tolist()
+            support = data['support'].tolist()
+            has_support = data['has_support'].tobytes()
+        for node in range(1, len(node_item)):
+            child = trie._add_child(parent[node], node_item[node])
+            trie.support[child] = support[node]
+            trie.has_support[child] = has_support[node]
+        trie.size = sum(has_support)
+        return trie
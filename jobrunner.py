@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from thefp import read_transactions_from_csv, generate_association_rules
+from theauto import run_engine, auto_mine, available_memory, ENGINES
+from shared_dataset import SharedDataset
+
+# Encoded datasets in shared memory by file path. Filled in the parent before
+# the pool starts; workers attach by handle instead of parsing or unpickling.
+DATASETS = {}
+
+# Rough peak memory of a job as a multiple of its dataset's in-memory size.
+MEMORY_FACTORS = {'bruteforce': 1.5, 'apriori': 3, 'fpgrowth': 4, 'eclat': 3, 'auto': 4}
+BYTES_PER_ITEM = 100
+
+# Columns of summary.csv; a failed job has its error and no counts or timings.
+SUMMARY_FIELDS = ['id', 'dataset', 'algorithm', 'engine', 'support', 'confidence', 'transactions', 'itemsets',
+                  'rules', 'mine_seconds', 'rules_seconds', 'load_seconds', 'error']
+
+
+def read_manifest(path):
+    # CSV with dataset, algorithm, support and confidence columns; support and
+    # confidence are percentages like the interactive prompts.
+    jobs = []
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            row = {k.strip().lower(): v.strip() for k, v in row.items()}
+            if row['algorithm'] not in ENGINES and row['algorithm'] != 'auto':
+                raise ValueError(f"unknown algorithm {row['algorithm']!r} in {path}")
+            jobs.append({'id': len(jobs) + 1, 'dataset': row['dataset'], 'algorithm': row['algorithm'],
+                         'support': float(row['support']) / 100, 'confidence': float(row['confidence']) / 100})
+    return jobs
+
+def load_datasets(jobs):
+    # Returns the load time of each dataset and the error of each one that
+    # could not be loaded; the jobs on those fail without stopping the rest.
+    load_seconds = {}
+    errors = {}
+    for job in jobs:
+        path = job['dataset']
+        if path not in DATASETS and path not in errors:
+            start = time.perf_counter()
+            try:
+                dataList = read_transactions_from_csv(path)
+                if dataList is None:
+                    raise FileNotFoundError(f"dataset not found: {path}")
+                DATASETS[path] = SharedDataset.from_dataframe(dataList)
+            except Exception as error:
+                errors[path] = f"{type(error).__name__}: {error}"
+                continue
+            load_seconds[path] = time.perf_counter() - start
+    return load_seconds, errors
+
+def failed_job(job, error):
+    return {'id': job['id'], 'dataset': job['dataset'], 'algorithm': job['algorithm'],
+            'support': job['support'], 'confidence': job['confidence'], 'error': error}
+
+def job_memory(job):
+    items = len(DATASETS[job['dataset']].item_ids)
+    return items * BYTES_PER_ITEM * MEMORY_FACTORS[job['algorithm']]
+
+def run_job(job, output_dir, handle=None):
+    if handle is None:
+        transactions = DATASETS[job['dataset']][:]
+    else:
+        dataset = SharedDataset.attach(handle)
+        transactions = dataset[:]
+        dataset.close()
+    start = time.perf_counter()
+    if job['algorithm'] == 'auto':
+        engine, profile, frequent_itemsets = auto_mine(transactions, job['support'])
+    else:
+        engine = job['algorithm']
+        frequent_itemsets = run_engine(engine, transactions, job['support'])
+    mined = time.perf_counter()
+    association_rules = generate_association_rules(frequent_itemsets, job['confidence'])
+    end = time.perf_counter()
+    result = {
+        'id': job['id'], 'dataset': job['dataset'], 'algorithm': job['algorithm'], 'engine': engine,
+        'support': job['support'], 'confidence': job['confidence'], 'transactions': len(transactions),
+        'itemsets': len(frequent_itemsets), 'rules': len(association_rules),
+        'mine_seconds': mined - start, 'rules_seconds': end - mined, 'error': '',
+    }
+    with open(os.path.join(output_dir, 'job_%d.json' % job['id']), 'w') as f:
+        json.dump(dict(result,
+                       frequent_itemsets=[[list(itemset), count] for itemset, count in frequent_itemsets.items()],
+                       association_rules=[[list(a), list(c), conf] for a, c, conf in association_rules]), f)
+    return result
+
+def run_jobs(jobs, output_dir, workers=None, memory_budget=None):
+    # Jobs start in manifest order while both a worker and enough of the memory
+    # budget are free; a job larger than the whole budget runs on its own. A job
+    # that fails, or whose dataset cannot be loaded, gets a summary row with
+    # its error and the other jobs carry on.
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count()
+    if memory_budget is None:
+        memory_budget = available_memory() * 0.8
+    load_seconds, load_errors = load_datasets(jobs)
+    results = [failed_job(job, load_errors[job['dataset']]) for job in jobs if job['dataset'] in load_errors]
+    pending = [job for job in jobs if job['dataset'] not in load_errors]
+    running = {}
+    in_use = 0
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            while pending or running:
+                while pending and len(running) < workers:
+                    needed = job_memory(pending[0])
+                    if running and in_use + needed > memory_budget:
+                        break
+                    job = pending.pop(0)
+                    try:
+                        future = pool.submit(run_job, job, output_dir, DATASETS[job['dataset']].handle)
+                    except BrokenProcessPool as error:
+                        # A worker died and took the pool with it.
+                        results.append(failed_job(job, f"{type(error).__name__}: {error}"))
+                        continue
+                    running[future] = job, needed
+                    in_use += needed
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, needed = running.pop(future)
+                    in_use -= needed
+                    try:
+                        result = future.result()
+                    except Exception as error:
+                        results.append(failed_job(job, f"{type(error).__name__}: {error}"))
+                        continue
+                    result['load_seconds'] = load_seconds[result['dataset']]
+                    results.append(result)
+    finally:
+        for dataset in DATASETS.values():
+            dataset.close()
+        DATASETS.clear()
+    results.sort(key=lambda r: r['id'])
+    with open(os.path.join(output_dir, 'summary.csv'), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    return results
+
+
+if __name__ == '__main__':
+    print("Welcome to the batch job runner.")
+    manifest = input("Enter the job manifest file (leave blank for jobs.csv): ") or 'jobs.csv'
+    output_dir = input("Enter the output directory (leave blank for results): ") or 'results'
+    workers = int(input("Enter the number of workers (leave blank for one per CPU): ") or 0) or None
+
+    try:
+        jobs = read_manifest(manifest)
+    except FileNotFoundError:
+        print("File not found. Please provide a valid file path.")
+        sys.exit(1)
+
+    start_time = time.time()
+    results = run_jobs(jobs, output_dir, workers)
+    end_time = time.time()
+
+    for result in results:
+        if result['error']:
+            print(f"Job {result['id']}: {result['dataset']} with {result['algorithm']} failed: {result['error']}")
+            continue
+        print(f"Job {result['id']}: {result['dataset']} with {result['engine']} at "
+              f"{result['support'] * 100}% support -> {result['itemsets']} itemsets, {result['rules']} rules "
+              f"in {result['mine_seconds'] + result['rules_seconds']:.4f} seconds")
+    print(f"Results written to {output_dir}")
+
+    print("-------------------------- RUNNING TIME:------------------------------------")
+    print("The Runtime of the program is: " + str(end_time - start_time) + "seconds")
+
+    print("---------------------------------------------------------------------------\n")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+
+import numpy as np
+
+# The innermost loops of the miners, behind one interface so the algorithms do
+# not change when the backend does:
+#   count_subsets(transactions, candidates) -> transactions holding each candidate
+#   hit_items(transactions, itemsets, min_hits)
+#       -> per transaction, the items in at least min_hits of the itemsets it holds
+#   conditional_pattern_base(node)          -> (prefix path, count) per node-link
+# 'python' is the reference backend, 'numpy' counts candidates with bitwise ANDs
+# over per-item transaction bitmaps. The backend is chosen with MINER_KERNEL or
+# use_kernel().
+
+# Upper bound on the bytes of one block of bitmaps built by the numpy backend.
+BATCH_BYTES = 1 << 26
+
+
+def ascend_tree(node):
+    path = []
+    while node and node.parent:
+        path.append(node.item)
+        node = node.parent
+    return path
+
+
+class PythonKernel:
+    name = 'python'
+
+    def count_subsets(self, transactions, candidates):
+        counts = []
+        for candidate in candidates:
+            candidate = frozenset(candidate)
+            count = 0
+            for transaction in transactions:
+                if candidate.issubset(transaction):
+                    count += 1
+            counts.append(count)
+        return counts
+
+    def hit_items(self, transactions, itemsets, min_hits):
+        result = []
+        for transaction in transactions:
+            transaction = set(transaction)
+            hits = {}
+            for itemset in itemsets:
+                if itemset <= transaction:
+                    for item in itemset:
+                        hits[item] = hits.get(item, 0) + 1
+            result.append([item for item, count in hits.items() if count >= min_hits])
+        return result
+
+    def conditional_pattern_base(self, node):
+        patterns = []
+        while node is not None:
+            prefix_path = ascend_tree(node)
+            if len(prefix_path) > 1:
+                patterns.append((tuple(prefix_path[1:]), node.count))
+            node = node.link
+        return patterns
+
+
+class NumpyKernel:
+    name = 'numpy'
+
+    def count_subsets(self, transactions, candidates):
+        # Each block of transactions becomes one packed bitmap row per candidate
+        # item, bit t set when transaction t holds the item, so a candidate's
+        # count is the popcount of the AND of its rows. Candidates are ANDed in
+        # batches of one size; the empty candidate is in every transaction.
+        item_ids, by_size, empty = group_by_size(candidates)
+        counts = np.zeros(len(candidates), dtype=np.int64)
+        counts[empty] = len(transactions)
+        if not item_ids:
+            return counts.tolist()
+        block = max(BATCH_BYTES // len(item_ids) // 8 * 8, 8)
+        for start in range(0, len(transactions), block):
+            bitmaps = self.bitmaps(transactions[start:start + block], item_ids)
+            for positions, rows in by_size:
+                batch = max(BATCH_BYTES // (bitmaps.shape[1] * rows.shape[1]), 1)
+                for first in range(0, len(rows), batch):
+                    common = np.bitwise_and.reduce(bitmaps[rows[first:first + batch]], axis=1)
+                    counts[positions[first:first + batch]] += popcount(common)
+        return counts.tolist()
+
+    def hit_items(self, transactions, itemsets, min_hits):
+        # The containment bits of each itemset (the AND of its item rows, as in
+        # count_subsets) are added to the rows of its items with a product by
+        # the item/itemset incidence matrix, giving hits per item and transaction.
+        item_ids, by_size, _ = group_by_size(itemsets)
+        if not item_ids:
+            return [[] for _ in transactions]
+        items = np.empty(len(item_ids), dtype=object)
+        items[:] = list(item_ids)
+        result = []
+        block = max(BATCH_BYTES // (4 * max(len(item_ids), 256)) // 8 * 8, 8)
+        for start in range(0, len(transactions), block):
+            chunk = transactions[start:start + block]
+            bitmaps = self.bitmaps(chunk, item_ids)
+            hits = np.zeros((len(item_ids), len(chunk)), dtype=np.float32)
+            for _, rows in by_size:
+                batch = max(BATCH_BYTES // (4 * max(len(chunk), 1)), 1)
+                for first in range(0, len(rows), batch):
+                    members = rows[first:first + batch]
+                    contained = np.unpackbits(np.bitwise_and.reduce(bitmaps[members], axis=1), axis=1, count=len(chunk))
+                    incidence = np.zeros((len(item_ids), len(members)), dtype=np.float32)
+                    incidence[members, np.arange(len(members))[:, None]] = 1
+                    hits += incidence @ contained.astype(np.float32)
+            tids, kept = np.nonzero((hits >= min_hits).T)
+            names = items[kept].tolist()
+            bounds = np.zeros(len(chunk) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(tids, minlength=len(chunk)), out=bounds[1:])
+            bounds = bounds.tolist()
+            result.extend(names[a:b] for a, b in zip(bounds[:-1], bounds[1:]))
+        return result
+
+    def bitmaps(self, transactions, item_ids):
+        rows, columns = [], []
+        for tid, transaction in enumerate(transactions):
+            for item in transaction:
+                row = item_ids.get(item)
+                if row is not None:
+                    rows.append(row)
+                    columns.append(tid)
+        bits = np.zeros((len(item_ids), len(transactions)), dtype=bool)
+        bits[rows, columns] = True
+        return np.packbits(bits, axis=1)
+
+    def conditional_pattern_base(self, node):
+        # Node links are pointer chasing that NumPy cannot batch, so this is the
+        # reference walk without the intermediate lists and slices.
+        patterns = []
+        while node is not None:
+            path = []
+            parent = node.parent
+            while parent is not None and parent.parent is not None:
+                path.append(parent.item)
+                parent = parent.parent
+            if path:
+                patterns.append((tuple(path), node.count))
+            node = node.link
+        return patterns
+
+
+def group_by_size(itemsets):
+    # Dictionary-encodes the items and groups the itemsets by size into
+    # (positions, item id rows) arrays; also returns the empty itemsets' positions.
+    item_ids = {}
+    by_size = {}
+    empty = []
+    for position, itemset in enumerate(itemsets):
+        ids = [item_ids.setdefault(item, len(item_ids)) for item in itemset]
+        if ids:
+            positions, rows = by_size.setdefault(len(ids), ([], []))
+            positions.append(position)
+            rows.append(ids)
+        else:
+            empty.append(position)
+    by_size = [(np.array(positions), np.array(rows, dtype=np.intp)) for positions, rows in by_size.values()]
+    return item_ids, by_size, empty
+
+def popcount(bitmaps):
+    # Set bits per row of a 2-d uint8 array.
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bitmaps).sum(axis=1, dtype=np.int64)
+    return POPCOUNT_TABLE[bitmaps].sum(axis=1, dtype=np.int64)
+
+POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+KERNELS = {'python': PythonKernel(), 'numpy': NumpyKernel()}
+kernel = KERNELS[os.environ.get('MINER_KERNEL', 'numpy')]
+
+
+def use_kernel(name):
+    global kernel
+    if name not in KERNELS:
+        raise ValueError(f"unknown kernel {name!r}, expected one of {sorted(KERNELS)}")
+    kernel = KERNELS[name]
+
+def count_subsets(transactions, candidates):
+    # Datasets that split the work themselves (shared_dataset.SharedDataset)
+    # are counted their way.
+    if hasattr(transactions, 'count_subsets'):
+        return transactions.count_subsets(candidates)
+    return kernel.count_subsets(transactions, candidates)
+
+def hit_items(transactions, itemsets, min_hits):
+    return kernel.hit_items(transactions, itemsets, min_hits)
+
+def conditional_pattern_base(node):
+    return kernel.conditional_pattern_base(node)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import sys
+import json
+import asyncio
+import heapq
+
+from thefp import (read_transactions_from_csv, load_transactions, convert_to_freq_dict,
+                   fp_growth, generate_association_rules)
+
+
+class RuleIndex:
+    # Trie over sorted antecedent item ids. Every node keeps the rules whose
+    # antecedent ends there, so a basket query only walks the antecedents that
+    # are fully contained in the basket. The rules of a node are kept sorted by
+    # confidence and by lift, and a query merges the matched nodes' lists in
+    # descending score, so it stops after the top distinct consequents instead
+    # of scoring every matched rule.
+    def __init__(self):
+        self.item_ids = {}
+        self.items = []
+        self.children = [{}]
+        self.rules = [[]]
+        self.ranked = None
+
+    def item_id(self, item):
+        if item not in self.item_ids:
+            self.item_ids[item] = len(self.items)
+            self.items.append(item)
+        return self.item_ids[item]
+
+    def add_rule(self, antecedent, consequent, confidence, lift=None):
+        node = 0
+        for i in sorted(self.item_id(item) for item in antecedent):
+            child = self.children[node].get(i)
+            if child is None:
+                child = len(self.children)
+                self.children[node][i] = child
+                self.children.append({})
+                self.rules.append([])
+            node = child
+        consequent = tuple(sorted(self.item_id(item) for item in consequent))
+        self.rules[node].append((consequent, confidence, lift))
+        self.ranked = None
+
+    def rank_rules(self):
+        # Per score, the rules of every node as (-score, consequent, confidence,
+        # lift) in ascending order, i.e. best first with ties broken by
+        # consequent; rules without a lift are left out of the lift lists.
+        self.ranked = {'confidence': [], 'lift': []}
+        for rules in self.rules:
+            self.ranked['confidence'].append(sorted(((-confidence, consequent, confidence, lift)
+                                                     for consequent, confidence, lift in rules), key=lambda r: r[:2]))
+            self.ranked['lift'].append(sorted(((-lift, consequent, confidence, lift)
+                                               for consequent, confidence, lift in rules if lift is not None), key=lambda r: r[:2]))
+
+    def __len__(self):
+        return sum(len(rules) for rules in self.rules)
+
+    def query(self, basket, top=5, by='confidence'):
+        if by not in ('confidence', 'lift'):
+            raise ValueError("by must be 'confidence' or 'lift'")
+        if self.ranked is None:
+            self.rank_rules()
+        ranked = self.ranked[by]
+        ids = sorted({self.item_ids[item] for item in basket if item in self.item_ids})
+        in_basket = set(ids)
+        # Heads of the ranked lists of all matched nodes, merged best first. The
+        # first time a consequent comes out is its best score.
+        heads = []
+        stack = [(0, 0)]
+        while stack:
+            node, start = stack.pop()
+            for pos in range(start, len(ids)):
+                child = self.children[node].get(ids[pos])
+                if child is None:
+                    continue
+                if ranked[child]:
+                    heads.append((ranked[child][0][:2], child, 0))
+                stack.append((child, pos + 1))
+        heapq.heapify(heads)
+        seen = set()
+        result = []
+        while heads and len(result) < top:
+            _, node, pos = heads[0]
+            _, consequent, confidence, lift = ranked[node][pos]
+            if pos + 1 < len(ranked[node]):
+                heapq.heapreplace(heads, (ranked[node][pos + 1][:2], node, pos + 1))
+            else:
+                heapq.heappop(heads)
+            if consequent in seen or in_basket.issuperset(consequent):
+                continue
+            seen.add(consequent)
+            result.append({'consequent': [self.items[i] for i in consequent], 'confidence': confidence, 'lift': lift})
+        return result
+
+    def query_batch(self, baskets, top=5, by='confidence'):
+        return [self.query(basket, top, by) for basket in baskets]
+
+
+def lookup_support(frequent_itemsets, itemset):
+    if tuple(sorted(itemset)) in frequent_itemsets:
+        return frequent_itemsets[tuple(sorted(itemset))]
+    return frequent_itemsets.get(frozenset(itemset))
+
+def build_rule_index(association_rules, frequent_itemsets=None, total=1):
+    # association_rules as returned by generate_association_rules:
+    # (antecedent, consequent, confidence). Lift needs the itemset supports,
+    # given as counts with total transactions or as fractions with total=1.
+    index = RuleIndex()
+    for antecedent, consequent, confidence in association_rules:
+        lift = None
+        if frequent_itemsets is not None:
+            consequent_support = lookup_support(frequent_itemsets, consequent)
+            if consequent_support:
+                lift = confidence / (consequent_support / total)
+        index.add_rule(antecedent, consequent, confidence, lift)
+    return index
+
+def build_rule_index_from_apriori(fresult, support):
+    # fresult as returned by EvaluateAssociationRules: [Rule, support, confidence].
+    index = RuleIndex()
+    for rule, rule_support, confidence in fresult:
+        consequent_support = support.get(frozenset(rule.right))
+        lift = confidence / consequent_support if consequent_support else None
+        index.add_rule(rule.left, rule.right, confidence, lift)
+    return index
+
+
+def answer(index, request):
+    top = int(request.get('top', 5))
+    by = request.get('by', 'confidence')
+    if 'baskets' in request:
+        return {'results': index.query_batch(request['baskets'], top, by)}
+    if 'basket' in request:
+        return {'result': index.query(request['basket'], top, by)}
+    return {'error': "request needs a 'basket' or 'baskets' field"}
+
+async def handle_client(index, reader, writer):
+    # One JSON request per line, one JSON response per line.
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                response = answer(index, json.loads(line))
+            except (ValueError, TypeError, AttributeError) as e:
+                response = {'error': str(e)}
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+    finally:
+        writer.close()
+
+async def start_rule_server(index, host='127.0.0.1', port=8765):
+    return await asyncio.start_server(lambda r, w: handle_client(index, r, w), host, port)
+
+def serve(index, host='127.0.0.1', port=8765):
+    async def main():
+        server = await start_rule_server(index, host, port)
+        async with server:
+            await server.serve_forever()
+    asyncio.run(main())
+
+async def query_rule_server(baskets, host='127.0.0.1', port=8765, top=5, by='confidence'):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(json.dumps({'baskets': baskets, 'top': top, 'by': by}).encode() + b'\n')
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return response
+
+
+if __name__ == '__main__':
+    print("Welcome to the association rule lookup server.")
+    print("Please choose the dataset you want:")
+
+    datasets = {
+        '1': 'Nike.csv',
+        '2': 'Kmart - Sheet1.csv',
+        '3': 'Cars_List.csv',
+        '4': 'Games_Transaction_List.csv',
+        '5': 'Costco.csv'
+    }
+
+    while True:
+        choice_of_data = input("Enter your choice: ")
+        if choice_of_data in datasets:
+            file_path = datasets[choice_of_data]
+            print(f"User chose {file_path} dataset")
+            break
+        else:
+            print("Invalid choice. Please enter the number corresponding to the dataset.")
+
+    minsupport = float(input("Enter the Minimum Support (in percentage): ")) / 100
+    minconfidence = float(input("Enter the Minimum Confidence (in percentage): ")) / 100
+    port = int(input("Enter the port to listen on: ") or 8765)
+
+    dataList = read_transactions_from_csv(file_path)
+    if dataList is None:
+        sys.exit(1)
+
+    Transactions = load_transactions(dataList)
+    data = convert_to_freq_dict(Transactions)
+    frequent_itemsets = fp_growth(data, minsupport * len(Transactions))
+    association_rules = generate_association_rules(frequent_itemsets, minconfidence)
+    index = build_rule_index(association_rules, frequent_itemsets, len(Transactions))
+
+    print(f"Indexed {len(index)} rules, listening on 127.0.0.1:{port}")
+    serve(index, port=port)
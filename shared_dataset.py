@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import multiprocessing
+from collections.abc import Sequence
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import kernels
+from transactions import encode_transactions, encode_baskets, decode_transactions
+
+# Baskets decoded at a time while iterating, and the fewest baskets worth
+# handing to a counting worker.
+DECODE_CHUNK = 65536
+MIN_CHUNK = 10000
+
+
+class SharedDataset(Sequence):
+    # The offsets and item_ids arrays of encode_transactions in one
+    # shared-memory block. Worker processes attach with
+    # SharedDataset.attach(dataset.handle) and read the arrays in place; only
+    # the handle (block name, sizes and item names) is pickled. Indexing and
+    # iterating decode baskets to lists of item names, so a SharedDataset can
+    # stand in for the list of transactions the miners take, and
+    # kernels.count_subsets splits its counting across self.workers processes.
+    #
+    # Attaching processes must be started by the creating one (a pool or
+    # transport on the same machine); the creator unlinks the block. The
+    # counting pool is started on first use and kept until close().
+    def __init__(self, block, n, size, items, owner, workers=1):
+        self.block = block
+        self.items = items
+        self.owner = owner
+        self.workers = workers
+        self.pool = None
+        self.offsets = np.ndarray(n + 1, dtype=np.int64, buffer=block.buf)
+        self.item_ids = np.ndarray(size, dtype=np.int32, buffer=block.buf, offset=(n + 1) * 8)
+
+    @classmethod
+    def create(cls, offsets, item_ids, items, workers=None):
+        block = shared_memory.SharedMemory(create=True, size=max(offsets.nbytes + len(item_ids) * 4, 1))
+        dataset = cls(block, len(offsets) - 1, len(item_ids), np.asarray(items, dtype=object), True,
+                      workers or os.cpu_count())
+        dataset.offsets[:] = offsets
+        dataset.item_ids[:] = item_ids
+        return dataset
+
+    @classmethod
+    def from_dataframe(cls, dataList, workers=None):
+        return cls.create(*encode_transactions(dataList), workers=workers)
+
+    @classmethod
+    def from_transactions(cls, transactions, workers=None):
+        return cls.create(*encode_baskets(transactions), workers=workers)
+
+    @classmethod
+    def attach(cls, handle):
+        name, n, size, items = handle
+        return cls(shared_memory.SharedMemory(name=name), n, size, items, False)
+
+    @property
+    def handle(self):
+        return self.block.name, len(self), len(self.item_ids), self.items
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self.decode(start, max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('transaction index out of range')
+        return self.items[self.item_ids[self.offsets[index]:self.offsets[index + 1]]].tolist()
+
+    def __iter__(self):
+        for start in range(0, len(self), DECODE_CHUNK):
+            yield from self.decode(start, min(start + DECODE_CHUNK, len(self)))
+
+    def decode(self, start, stop):
+        offsets = self.offsets[start:stop + 1]
+        return decode_transactions(offsets - offsets[0], self.item_ids[offsets[0]:offsets[-1]], self.items)
+
+    def item_counts(self):
+        # Number of baskets holding each item, items being unique per basket.
+        counts = np.bincount(self.item_ids, minlength=len(self.items))
+        return dict(zip(self.items.tolist(), counts.tolist()))
+
+    def count_subsets(self, candidates):
+        # Counts with the active kernel on contiguous ranges of baskets, one
+        # range per worker; small datasets are counted in this process.
+        chunk = max(MIN_CHUNK, -(-len(self) // self.workers))
+        ranges = [(start, min(start + chunk, len(self))) for start in range(0, len(self), chunk)]
+        if len(ranges) <= 1:
+            return kernels.kernel.count_subsets(self[:], candidates)
+        candidates = list(candidates)
+        tasks = [(self.handle, start, stop, candidates, kernels.kernel.name) for start, stop in ranges]
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.workers)
+        counts = self.pool.map(count_range, tasks)
+        return np.sum(counts, axis=0).tolist()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        # The array views must go before the block can be closed.
+        self.offsets = self.item_ids = None
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def count_range(task):
+    handle, start, stop, candidates, kernel = task
+    dataset = SharedDataset.attach(handle)
+    try:
+        return kernels.KERNELS[kernel].count_subsets(dataset.decode(start, stop), candidates)
+    finally:
+        dataset.close()
@@ -4,63 +4,25 @@
 # In[1]:
 
 
+import os
 import sys
+import json
 import time
+import zlib
 import numpy as np
 import pandas as pd
+from itertools import combinations
+import kernels
+from itemset_trie import ItemsetTrie
+from transactions import load_transactions, encode_baskets
 
-print("Welcome to the apriori algorithms. \n Please chose the dataset you want: \n 1. Nike \n 2.Kmart \n 3.Vehicles \n 4. Sports \n 5.Costco") 
-while True:
-    choice_of_data=input()
-    if(choice_of_data=='1'):
-        dataList=pd.read_csv('Nike.csv')
-        print('User chose Test dataset')
-        break
-    elif(choice_of_data=='2'):
-        dataList=pd.read_csv('Kmart - Sheet1.csv')
-        print('User chose Kmart dataset')
-        break
-    elif(choice_of_data=='3'):
-        dataList=pd.read_csv('Cars_List.csv')
-        print('User chose Cars  dataset')
-        break
-    elif(choice_of_data=='4'):
-        dataList=pd.read_csv('Games_Transaction_List.csv')
-        print('User chose Sports dataset')
-        break
-    elif(choice_of_data=='5'):
-        dataList=pd.read_csv('Costco.csv')
-        print('User chose Costco dataset')
-        break
-    else:
-        print("Invalid data, please enter the number corresponding to the data")
-        break     
-    
-
-
-print("Enter the Minimum Support (in percentage) : ", end=" ")
-minsupport = input()
-print("Enter the Minimum Confidence (in percentage) : ", end=" ")
-minconfidence = input()
-min_support = float(minsupport)/100
-min_conf = float(minconfidence)/100
-print('\n')
-print("The minimum support is :", minsupport)
-print("The minimum Confidence is :",minconfidence)
-
-def load_transactions(dataList):
-    Transactions = []
-    df_items = dataList['TransactionList']
-    comma_splitted_df = df_items.apply(lambda x: x.split(','))
-    for i in comma_splitted_df:
-        Transactions.append(i)
-    return Transactions
-load_transactions(dataList)
-
-Transactions = load_transactions(dataList)
-Transactions
+# Trimming stops once a pass keeps more than this share of item occurrences.
+TRIM_KEEP = 0.9
+# Pair ids built at a time by count_pairs.
+PAIR_BATCH = 1 << 22
 
 class Rule:
+    __slots__ = ('left', 'right', 'all', 'key')
 
     def __init__(self, left, right, all):
         self.left = list(left)
@@ -68,79 +30,219 @@ class Rule:
         self.right = list(right)
         self.right.sort()
         self.all = all
+        self.key = (tuple(self.left), tuple(self.right))
 
     def __str__(self):
         return ",".join(self.left)+" ==> "+",".join(self.right)
 
+    def __eq__(self, other):
+        return isinstance(other, Rule) and self.key == other.key
+
     def __hash__(self):
-        return hash(str(self))
-def scan(Transactions, Ck):
-    count = {s: 0 for s in Ck}
-    n = len(Transactions)
-    for t in Transactions:
-        for fset in Ck:
-            if fset.issubset(t):
-                count[fset] += 1
-    
-    return {fset: support/n for fset, support in count.items() if support/n>=min_support}
-def calculateCandidate(Lk):
+        return hash(self.key)
+def scan(Transactions, Ck, min_support, n=None):
+    Ck = list(Ck)
+    if n is None:
+        n = len(Transactions)
+    count = kernels.count_subsets(Transactions, Ck)
+    return {fset: support/n for fset, support in zip(Ck, count) if support/n>=min_support}
+def count_pairs(Transactions, L1, min_support, n=None):
+    # Counts every 2-itemset of frequent items in one pass into a triangular
+    # array indexed by frequent-item ids, then keeps the pairs above min_support.
+    # The baskets are encoded once and grouped by their number of frequent
+    # items, so the pairs of each group are indexed in one step.
+    if n is None:
+        n = len(Transactions)
+    items = sorted(item for fset in L1 for item in fset)
+    m = len(items)
+    if m < 2 or not n:
+        return {}
+    offsets, item_ids, names = encode_baskets(Transactions)
+    ids = {item: i for i, item in enumerate(items)}
+    remap = np.array([ids.get(name, -1) for name in names.tolist()], dtype=np.int64)
+    rows = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    fids = remap[item_ids]
+    keep = fids >= 0
+    rows, fids = rows[keep], fids[keep]
+    order = np.argsort(rows * m + fids, kind='stable')
+    fids = fids[order]
+    lengths = np.bincount(rows, minlength=len(offsets) - 1)
+    starts = np.zeros(len(lengths), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    pair_counts = np.zeros(m * (m - 1) // 2, dtype=np.int64)
+    for length in np.unique(lengths[lengths >= 2]).tolist():
+        first, second = np.triu_indices(length, 1)
+        group = starts[lengths == length]
+        batch = max(PAIR_BATCH // len(first), 1)
+        for start in range(0, len(group), batch):
+            baskets = fids[group[start:start + batch, None] + np.arange(length)]
+            i, j = baskets[:, first], baskets[:, second]
+            pair_counts += np.bincount((i * (2 * m - i - 1) // 2 + j - i - 1).ravel(), minlength=len(pair_counts))
+    first, second = np.triu_indices(m, 1)
+    frequent = np.nonzero(pair_counts / n >= min_support)[0]
+    return {frozenset([items[first[x]], items[second[x]]]): int(pair_counts[x]) / n for x in frequent}
+def calculateCandidate(Lk, key=None):
     res = []
-    print("len Lk", len(Lk))
     for i in range(len(Lk)):
         for j in range(i+1, len(Lk)):
             it1 = Lk[i]
             it2 = Lk[j]
             it11 = list(it1)
             it22 = list(it2)
-            it11.sort()
-            it22.sort()
-            print("it11",it11)
-            print("it22",it22)
+            it11.sort(key=key)
+            it22.sort(key=key)
             if it11[:len(it1)-1] == it22[:len(it1)-1]:
                 res.append(it1 | it2)
-                print("Res: ", res)
     return res
-def calculate_frequency_support():
-    support = {}
-    candidate = [[]]
-    Lk = [[]]
-    C1 = set()
+def trim_transactions(Transactions, Lk, k, min_hits=None):
+    # An item can only be part of a frequent (k+1)-itemset in t if it belongs to
+    # at least k of the frequent k-itemsets contained in t, and t needs at least
+    # k+1 such items. Everything else is dropped before the next pass.
+    if min_hits is None:
+        min_hits = k
+    trimmed = []
+    for kept in kernels.hit_items(Transactions, Lk, min_hits):
+        if len(kept) > k:
+            trimmed.append(kept)
+    return trimmed
+def shrinks(before, after):
+    # Trimming tests every transaction against every frequent itemset. Once a
+    # pass keeps most item occurrences it no longer pays for those tests, and
+    # the levels after it keep counting on the last trimmed transactions.
+    return sum(map(len, after)) < TRIM_KEEP * sum(map(len, before))
+def save_level(checkpoint_dir, k, count):
+    level = ItemsetTrie()
+    level.update(count)
+    # Written under a temporary name first so a crash never leaves a half level.
+    path = os.path.join(checkpoint_dir, 'level_%d' % k)
+    level.save(path + '.tmp.npz')
+    os.replace(path + '.tmp.npz', path + '.npz')
+def load_levels(checkpoint_dir, params):
+    # Returns the finished levels of a checkpoint written with the same
+    # parameters, or starts a new checkpoint in checkpoint_dir.
+    meta_path = os.path.join(checkpoint_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        with open(meta_path, 'w') as f:
+            json.dump(params, f)
+        return []
+    with open(meta_path) as f:
+        if json.load(f) != params:
+            raise ValueError(f"checkpoint in {checkpoint_dir} was written for a different dataset or parameters")
+    levels = []
+    while os.path.exists(os.path.join(checkpoint_dir, 'level_%d.npz' % (len(levels) + 1))):
+        level = ItemsetTrie.load(os.path.join(checkpoint_dir, 'level_%d.npz' % (len(levels) + 1)))
+        levels.append({frozenset(fset): fset_support for fset, fset_support in level.items()})
+    return levels
+def transactions_checksum(Transactions):
+    checksum = 0
     for t in Transactions:
-        for item in t:
-            C1.add(frozenset([item]))
-            #print(C1)
-            #print("*****")
-    print("----------------------------------------")
-    print("C1: ", C1)
-    candidate.append(C1)
-    #print(candidate)
-    print("----------------------------------------")
-    print("Transactions: ",Transactions)
-    count = scan(Transactions, C1)
-    print("----------------------------------------")
-    print("Count: ", count)
-    Lk.append(list(count.keys()))
-    print("----------------------------------------")
-    print("Lk: ", Lk)
-    support.update(count)
-    print("----------------------------------------")
-    print("support: ", support)
-    print("----------------------------------------")
-    print("candidate: ",candidate)
-    k = 1
-    while len(Lk[k]) > 0:
-        print("+++++++++++++++++++++++++++++++++++++++")
-        print("k=", k)
-        print("Lk[k]: ", Lk[k])
-        candidate.append(calculateCandidate(Lk[k]))
-        print("candidate: ", candidate)
-        print("candidate[k+1]: ",candidate[k+1])
-        count = scan(Transactions, candidate[k+1])
+        checksum = zlib.crc32('\x1f'.join(map(str, t)).encode() + b'\x1e', checksum)
+    return checksum
+def iter_levels(Transactions, min_support, max_length=None, excluded=frozenset(), checkpoint_dir=None, item_supports=None):
+    # Yields (k, {itemset: support}) for each level. Only the current level and
+    # the trimmed transactions are kept between passes. With checkpoint_dir every
+    # level is saved as it finishes and a rerun picks up after the last one.
+    #
+    # item_supports gives items their own minimum support (MS-Apriori); an
+    # itemset is frequent when it reaches the lowest one among its items. Items
+    # are then joined in ascending minimum-support order, so both parents of a
+    # candidate keep its lowest-support item and have the same threshold. Level 1
+    # keeps every item that reaches the lowest threshold of a frequent item,
+    # since those can still pair with rarer items, and only the subsets holding
+    # the lowest-support item are guaranteed frequent when trimming.
+    n = len(Transactions)
+    if item_supports is None:
+        mis = lambda item: min_support
+        key = None
+    else:
+        mis = lambda item: item_supports.get(item, min_support)
+        key = lambda item: (mis(item), item)
+    frequent = lambda count: {fs: v for fs, v in count.items() if v >= min(mis(item) for item in fs)}
+    min_hits = lambda k: k if item_supports is None else max(k - 1, 1)
+    levels = []
+    if checkpoint_dir is not None:
+        params = {'min_support': min_support, 'max_length': max_length, 'excluded': sorted(map(str, excluded)),
+                  'item_supports': sorted([str(item), v] for item, v in (item_supports or {}).items()),
+                  'transactions': n, 'checksum': transactions_checksum(Transactions)}
+        levels = load_levels(checkpoint_dir, params)
+    if levels:
+        for k, count in enumerate(levels, 1):
+            yield k, frequent(count) if k == 1 else count
+        k = len(levels)
+        Lk = list(levels[-1].keys())
+        lowest = min([mis(item) for fs in frequent(levels[0]) for item in fs], default=min_support)
+        del levels
+        # Trimming the original transactions with the last level keeps the same
+        # items as trimming them level by level.
+        database = trim_transactions(Transactions, Lk, k, min_hits(k))
+        trimming = shrinks(Transactions, database)
+    else:
+        C1 = set()
+        for t in Transactions:
+            for item in t:
+                if item not in excluded:
+                    C1.add(frozenset([item]))
+        lowest = min([mis(item) for fs in C1 for item in fs], default=min_support)
+        count = scan(Transactions, C1, lowest)
+        lowest = min([mis(item) for fs in frequent(count) for item in fs], default=min_support)
+        count = {fs: v for fs, v in count.items() if v >= lowest}
+        if checkpoint_dir is not None:
+            save_level(checkpoint_dir, 1, count)
+        yield 1, frequent(count)
+        Lk = list(count.keys())
+        k = 1
+        database = trim_transactions(Transactions, Lk, k)
+        trimming = shrinks(Transactions, database)
+    while len(Lk) > 0 and (max_length is None or k < max_length):
+        if k == 1:
+            # Pairs are counted directly, no candidate list is built for level 2.
+            count = count_pairs(database, Lk, lowest, n)
+        else:
+            count = scan(database, calculateCandidate(Lk, key), lowest, n)
+        count = frequent(count)
+        k += 1
+        if checkpoint_dir is not None:
+            save_level(checkpoint_dir, k, count)
+        yield k, count
+        Lk = list(count.keys())
+        if trimming and Lk:
+            trimmed = trim_transactions(database, Lk, k, min_hits(k))
+            trimming = shrinks(database, trimmed)
+            database = trimmed
+def iter_apriori(Transactions, min_support, min_length=1, max_length=None, required=frozenset(), excluded=frozenset(), checkpoint_dir=None, item_supports=None):
+    for k, count in iter_levels(Transactions, min_support, max_length, excluded, checkpoint_dir, item_supports):
+        if k < min_length:
+            continue
+        for fset, fset_support in count.items():
+            if required.issubset(fset):
+                yield fset, fset_support
+def fill_missing_support(Transactions, frequent, support):
+    # With multiple minimum supports the subsets of a frequent itemset that lack
+    # its lowest-support item need not be frequent; rules still need their
+    # supports, so they are counted in one extra pass.
+    missing = set()
+    for level in frequent:
+        for fs in level:
+            for size in range(1, len(fs)):
+                for subset in combinations(fs, size):
+                    if subset not in support:
+                        missing.add(frozenset(subset))
+    if missing:
+        support.update(scan(Transactions, missing, 0))
+def calculate_frequency_support(Transactions, min_support, min_length=1, max_length=None, required=frozenset(), excluded=frozenset(), checkpoint_dir=None, item_supports=None):
+    support = ItemsetTrie()
+    Lk = [[]]
+    for k, count in iter_levels(Transactions, min_support, max_length, excluded, checkpoint_dir, item_supports):
         support.update(count)
         Lk.append(list(count.keys()))
-        k += 1
+    if item_supports is not None:
+        fill_missing_support(Transactions, Lk, support)
+    # Length and required-item constraints only filter the levels; support keeps
+    # every counted itemset so rule confidences can still be computed.
+    Lk = [[fs for fs in level if len(fs) >= min_length and required.issubset(fs)] for level in Lk]
     return Lk, support
-def EvaluateSecondaryRules(fs, rights, fresult, support):
+def EvaluateSecondaryRules(fs, rights, fresult, support, min_conf):
     rlength = len(rights[0])
     totlength = len(fs)
     if totlength-rlength > 0:
@@ -156,12 +258,12 @@ def EvaluateSecondaryRules(fs, rights, fresult, support):
                 new_right.append(right)
 
         if len(new_right) > 1:
-            EvaluateSecondaryRules(fs, new_right, fresult, support)
-def EvaluateAssociationRules(frequent, support):
+            EvaluateSecondaryRules(fs, new_right, fresult, support, min_conf)
+def EvaluateAssociationRules(frequent, support, min_conf):
     fresult = []
     for i in range(2, len(frequent)):
         if len(frequent[i]) == 0:
-            break
+            continue
         freq_sets = frequent[i]
 
         for fs in freq_sets:
@@ -175,17 +277,72 @@ def EvaluateAssociationRules(frequent, support):
 
             for fs in freq_sets:
                 right = [frozenset([x]) for x in fs]
-                EvaluateSecondaryRules(fs, right, fresult, support)
+                EvaluateSecondaryRules(fs, right, fresult, support, min_conf)
 
-    fresult.sort(key=lambda x: str(x[0]))
+    fresult.sort(key=lambda x: x[0].key)
     return fresult
 if __name__ == '__main__':
+    print("Welcome to the apriori algorithms. \n Please chose the dataset you want: \n 1. Nike \n 2.Kmart \n 3.Vehicles \n 4. Sports \n 5.Costco") 
+    while True:
+        choice_of_data=input()
+        if(choice_of_data=='1'):
+            dataList=pd.read_csv('Nike.csv')
+            print('User chose Test dataset')
+            break
+        elif(choice_of_data=='2'):
+            dataList=pd.read_csv('Kmart - Sheet1.csv')
+            print('User chose Kmart dataset')
+            break
+        elif(choice_of_data=='3'):
+            dataList=pd.read_csv('Cars_List.csv')
+            print('User chose Cars  dataset')
+            break
+        elif(choice_of_data=='4'):
+            dataList=pd.read_csv('Games_Transaction_List.csv')
+            print('User chose Sports dataset')
+            break
+        elif(choice_of_data=='5'):
+            dataList=pd.read_csv('Costco.csv')
+            print('User chose Costco dataset')
+            break
+        else:
+            print("Invalid data, please enter the number corresponding to the data")
+            break
+
+    print("Enter the Minimum Support (in percentage) : ", end=" ")
+    minsupport = input()
+    print("Enter the Minimum Confidence (in percentage) : ", end=" ")
+    minconfidence = input()
+    min_support = float(minsupport)/100
+    min_conf = float(minconfidence)/100
+    print("Enter the Minimum Itemset Length (leave blank for 1) : ", end=" ")
+    min_length = int(input() or 1)
+    print("Enter the Maximum Itemset Length (leave blank for no limit) : ", end=" ")
+    max_length = int(input() or 0) or None
+    print("Enter items every itemset must contain (comma separated, leave blank for none) : ", end=" ")
+    required_items = frozenset(item.strip() for item in input().split(',') if item.strip())
+    print("Enter items to exclude (comma separated, leave blank for none) : ", end=" ")
+    excluded_items = frozenset(item.strip() for item in input().split(',') if item.strip())
+    print("Enter a checkpoint directory to save progress to or resume from (leave blank for none) : ", end=" ")
+    checkpoint_dir = input() or None
+    print("Enter item minimum supports as item:percentage pairs (comma separated, leave blank for none) : ", end=" ")
+    item_supports = {}
+    for pair in input().split(','):
+        if pair.strip():
+            item, value = pair.rsplit(':', 1)
+            item_supports[item.strip()] = float(value) / 100
+    item_supports = item_supports or None
+    print('\n')
+    print("The minimum support is :", minsupport)
+    print("The minimum Confidence is :",minconfidence)
+
+    Transactions = load_transactions(dataList)
 
     start_time = time.time()
-    freq, supp = calculate_frequency_support()
+    freq, supp = calculate_frequency_support(Transactions, min_support, min_length, max_length, required_items, excluded_items, checkpoint_dir, item_supports)
     print("Frequency: ",freq)
     print("Support: ", supp)
-    fresult = EvaluateAssociationRules(freq, supp)
+    fresult = EvaluateAssociationRules(freq, supp, min_conf)
     end_time = time.time()
     
     print("\n----- > Association With Support and Confidence: < -------\n")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import sys
+import time
+
+from thefp import read_transactions_from_csv, load_transactions, generate_association_rules
+from itemset_trie import ItemsetTrie
+
+
+def build_tidsets(transactions):
+    tidsets = {}
+    for tid, transaction in enumerate(transactions):
+        for item in transaction:
+            tidsets.setdefault(item, set()).add(tid)
+    return tidsets
+
+def eclat(transactions, min_support):
+    tidsets = build_tidsets(transactions)
+    members = [(item, tids, len(tids)) for item, tids in tidsets.items() if len(tids) >= min_support]
+    members.sort(key=lambda p: p[2])
+    frequent_itemsets = ItemsetTrie('q')
+    mine_class((), members, min_support, frequent_itemsets, False)
+    return frequent_itemsets
+
+def mine_class(prefix, members, min_support, frequent_itemsets, use_diffsets):
+    # members are (item, tidset or diffset, support) for the itemsets prefix + item.
+    # With diffsets, d(Pxy) = d(Py) - d(Px) and sup(Pxy) = sup(Px) - |d(Pxy)|.
+    for i, (item, tids, support) in enumerate(members):
+        itemset = prefix + (item,)
+        frequent_itemsets[tuple(sorted(itemset))] = support
+        children = []
+        if use_diffsets:
+            for other, other_tids, other_support in members[i + 1:]:
+                diff = other_tids - tids
+                if support - len(diff) >= min_support:
+                    children.append((other, diff, support - len(diff)))
+        else:
+            for other, other_tids, other_support in members[i + 1:]:
+                common = tids & other_tids
+                if len(common) >= min_support:
+                    children.append((other, common, len(common)))
+        child_diffsets = use_diffsets
+        # Dense class: the diffsets t(Px) - t(Pxy) are smaller than the tidsets.
+        if not use_diffsets and sum(len(c[1]) for c in children) > sum(support - c[2] for c in children):
+            children = [(other, tids - common, child_support) for other, common, child_support in children]
+            child_diffsets = True
+        if children:
+            mine_class(itemset, children, min_support, frequent_itemsets, child_diffsets)
+
+
+if __name__ == '__main__':
+    print("Welcome to the Eclat algorithm.")
+    print("Please choose the dataset you want:")
+
+    datasets = {
+        '1': 'Nike.csv',
+        '2': 'Kmart - Sheet1.csv',
+        '3': 'Cars_List.csv',
+        '4': 'Games_Transaction_List.csv',
+        '5': 'Costco.csv'
+    }
+
+    while True:
+        choice_of_data = input("Enter your choice: ")
+        if choice_of_data in datasets:
+            file_path = datasets[choice_of_data]
+            print(f"User chose {file_path} dataset")
+            break
+        else:
+            print("Invalid choice. Please enter the number corresponding to the dataset.")
+
+    dataList = read_transactions_from_csv(file_path)
+    if dataList is None:
+        sys.exit(1)
+
+    minsupport = float(input("Enter the Minimum Support (in percentage): ")) / 100
+    minconfidence = float(input("Enter the Minimum Confidence (in percentage): ")) / 100
+
+    Transactions = load_transactions(dataList)
+
+    start_time = time.time()
+    frequent_itemsets = eclat(Transactions, minsupport * len(Transactions))
+    association_rules = generate_association_rules(frequent_itemsets, minconfidence)
+    end_time = time.time()
+
+    print("\nFrequent itemsets found with Eclat algorithm:")
+    for itemset, support in frequent_itemsets.items():
+        print(f"Itemset: {itemset}, Support: {support}")
+
+    print("\nAssociation rules found with Eclat algorithm:")
+    for rule in association_rules:
+        antecedent = ', '.join(rule[0])
+        consequent = ', '.join(rule[1])
+        confidence = rule[2]
+        print(f"Rule: {antecedent} -> {consequent}, Confidence: {confidence}")
+
+    print("-------------------------- RUNNING TIME:------------------------------------")
+    print("The Runtime of the program is: " + str(end_time - start_time) + "seconds")
+
+    print("---------------------------------------------------------------------------\n")
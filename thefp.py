@@ -4,11 +4,18 @@
 # In[2]:
 
 
+import os
 import sys
+import json
 import time
+import zlib
+from itertools import combinations
 import numpy as np
 import pandas as pd
-from itertools import combinations
+import kernels
+from kernels import ascend_tree
+from itemset_trie import ItemsetTrie
+from transactions import load_transactions
 
 
 class TreeNode:
@@ -36,57 +43,240 @@ def update_header(node, target_node):
         node = node.link
     node.link = target_node
 
-def construct_fp_tree(data, min_support):
+def construct_fp_tree(data, min_support, excluded=frozenset(), item_rank=None):
     item_counts = {}
     for transaction, count in data.items():
         for item in transaction:
             item_counts[item] = item_counts.get(item, 0) + count
-    item_counts = {k: v for k, v in item_counts.items() if v >= min_support}
+    item_counts = {k: v for k, v in item_counts.items() if v >= min_support and k not in excluded}
     header_table = {item: [count, None] for item, count in item_counts.items()}
     tree_root = TreeNode(None, 1, None)
     for transaction, count in data.items():
         sorted_items = [item for item in transaction if item in item_counts]
-        sorted_items.sort(key=lambda x: item_counts[x], reverse=True)
+        if item_rank is None:
+            sorted_items.sort(key=lambda x: item_counts[x], reverse=True)
+        else:
+            sorted_items.sort(key=lambda x: item_rank[x])
         if len(sorted_items) > 0:
             insert_tree(sorted_items, tree_root, header_table, count)
     return tree_root, header_table
 
-def mine_tree(header_table, min_support, prefix, frequent_itemsets):
+def save_fp_tree(path, tree, header_table, min_support, total):
+    # Nodes are written parent-first as flat item/count/parent arrays; the
+    # header table and node links are rebuilt from them on load.
+    items = list(header_table)
+    item_ids = {item: i for i, item in enumerate(items)}
+    node_item, node_count, node_parent = [], [], []
+    stack = [(tree, -1)]
+    while stack:
+        node, parent = stack.pop()
+        for child in node.children.values():
+            node_item.append(item_ids[child.item])
+            node_count.append(child.count)
+            node_parent.append(parent)
+            stack.append((child, len(node_item) - 1))
+    np.savez_compressed(path,
+                        items=np.array(json.dumps(items)),
+                        node_item=np.array(node_item, dtype=np.int32),
+                        node_count=np.array(node_count, dtype=np.int64),
+                        node_parent=np.array(node_parent, dtype=np.int32),
+                        min_support=np.array(min_support),
+                        total=np.array(total))
+
+def load_fp_tree(path):
+    with np.load(path) as saved:
+        items = json.loads(str(saved['items']))
+        node_item = saved['node_item'].tolist()
+        node_count = saved['node_count'].tolist()
+        node_parent = saved['node_parent'].tolist()
+        min_support = saved['min_support'].item()
+        total = saved['total'].item()
+    tree = TreeNode(None, 1, None)
+    header_table = {item: [0, None] for item in items}
+    last_node = {}
+    nodes = []
+    for i, count, parent in zip(node_item, node_count, node_parent):
+        item = items[i]
+        parent_node = tree if parent == -1 else nodes[parent]
+        node = TreeNode(item, count, parent_node)
+        parent_node.children[item] = node
+        nodes.append(node)
+        header_table[item][0] += count
+        if item in last_node:
+            last_node[item].link = node
+        else:
+            header_table[item][1] = node
+        last_node[item] = node
+    return tree, header_table, min_support, total
+
+def mine_saved_fp_tree(path, min_support, min_length=1, max_length=None, required=frozenset()):
+    # Mines a tree saved by save_fp_tree at any min_support (absolute count) not
+    # below the one it was built with. Returns the itemsets and transaction total.
+    tree, header_table, floor, total = load_fp_tree(path)
+    return mine_fp_tree(header_table, floor, min_support, min_length, max_length, required), total
+
+def mine_fp_tree(header_table, floor, min_support, min_length=1, max_length=None, required=frozenset()):
+    if min_support < floor:
+        raise ValueError(f"the saved FP-tree was built with min_support {floor}, cannot mine at {min_support}")
+    header_table = {item: entry for item, entry in header_table.items()
+                    if entry[0] >= min_support}
+    frequent_itemsets = ItemsetTrie('q')
+    if required.issubset(header_table):
+        mine_tree(header_table, min_support, set(), frequent_itemsets, min_length, max_length, required)
+    return frequent_itemsets
+
+def mine_tree(header_table, min_support, prefix, frequent_itemsets, min_length=1, max_length=None, required=frozenset(), support=None):
+    for itemset, count in iter_mine_tree(header_table, min_support, prefix, min_length, max_length, required, support):
+        frequent_itemsets[itemset] = count
+
+def iter_mine_tree(header_table, min_support, prefix, min_length=1, max_length=None, required=frozenset(), support=None):
+    # Yields the itemsets that meet the length and required-item constraints;
+    # support, when given, also receives the ones that were mined but not
+    # yielded, as rule confidences need them.
     sorted_items = sorted(list(header_table.items()), key=lambda p: p[1][0])
     for item, (count, node) in sorted_items:
         new_prefix = prefix.copy()
         new_prefix.add(item)
-        frequent_itemsets[tuple(sorted(new_prefix))] = count
+        if support is not None:
+            support[tuple(sorted(new_prefix))] = count
+        if len(new_prefix) >= min_length and required.issubset(new_prefix):
+            yield tuple(sorted(new_prefix)), count
+        # Only extend the prefix if the conditional tree can still reach the
+        # length limits and supply every required item that is missing.
+        missing = required.difference(new_prefix)
+        if max_length is not None and len(new_prefix) + max(len(missing), 1) > max_length:
+            continue
         conditional_pattern_base = find_conditional_pattern_base(node)
         conditional_tree_data = {}
         for pattern, count in conditional_pattern_base:
             conditional_tree_data[pattern] = count
         conditional_tree_root, conditional_header_table = construct_fp_tree(conditional_tree_data, min_support)
-        if conditional_header_table:
-            mine_tree(conditional_header_table, min_support, new_prefix, frequent_itemsets)
+        if len(new_prefix) + len(conditional_header_table) < min_length:
+            continue
+        if conditional_header_table and missing.issubset(conditional_header_table):
+            yield from iter_mine_tree(conditional_header_table, min_support, new_prefix, min_length, max_length, required, support)
 
 def find_conditional_pattern_base(node):
-    patterns = []
-    while node is not None:
-        prefix_path = ascend_tree(node)
-        if len(prefix_path) > 1:
-            patterns.append((tuple(prefix_path[1:]), node.count))
-        node = node.link
-    return patterns
-
-def ascend_tree(node):
-    path = []
-    while node and node.parent:
-        path.append(node.item)
-        node = node.parent
-    return path
-
-def fp_growth(data, min_support):
-    tree, header_table = construct_fp_tree(data, min_support)
-    frequent_itemsets = {}
-    mine_tree(header_table, min_support, set(), frequent_itemsets)
+    return kernels.conditional_pattern_base(node)
+
+def fp_growth(data, min_support, min_length=1, max_length=None, required=frozenset(), excluded=frozenset(), checkpoint_dir=None, item_supports=None, support=None):
+    # The constraints only decide which itemsets are returned. Pass an
+    # ItemsetTrie as support to get the count of every returned itemset and of
+    # all their subsets, for generate_association_rules(..., support).
+    if item_supports is not None:
+        return fp_growth_multiple_supports(data, min_support, item_supports, min_length, max_length, required, excluded,
+                                           checkpoint_dir, support)
+    tree, header_table = construct_fp_tree(data, min_support, excluded)
+    frequent_itemsets = ItemsetTrie('q')
+    if not required.issubset(header_table):
+        return frequent_itemsets
+    if checkpoint_dir is None:
+        mine_tree(header_table, min_support, set(), frequent_itemsets, min_length, max_length, required, support)
+    else:
+        mine_tree_with_checkpoint(header_table, min_support, frequent_itemsets, checkpoint_dir, data_checksum(data),
+                                  min_length, max_length, required)
+    if support is not None:
+        fill_missing_support(data, frequent_itemsets, support)
     return frequent_itemsets
 
+def fill_missing_support(data, frequent_itemsets, support):
+    # Counts the subsets of the frequent itemsets that the pruned search never
+    # reached (those without a required item, or below the minimum length).
+    support.update(frequent_itemsets.items())
+    missing = set()
+    for itemset in frequent_itemsets.keys():
+        for size in range(1, len(itemset)):
+            for subset in combinations(itemset, size):
+                if subset not in support:
+                    missing.add(subset)
+    if not missing:
+        return
+    counts = dict.fromkeys(missing, 0)
+    for transaction, count in data.items():
+        transaction = set(transaction)
+        for itemset in missing:
+            if transaction.issuperset(itemset):
+                counts[itemset] += count
+    support.update(counts)
+
+def fp_growth_multiple_supports(data, min_support, item_supports, min_length=1, max_length=None, required=frozenset(), excluded=frozenset(), checkpoint_dir=None, support=None):
+    # CFP-Growth: item_supports gives items their own minimum support (items not
+    # in it use min_support) and an itemset is frequent when it reaches the
+    # lowest one among its items. The tree keeps every item above the lowest
+    # threshold, ordered by descending minimum support, so each top-level header
+    # item has the lowest threshold of every itemset mined from it and its
+    # conditional trees are built at that threshold.
+    mis = lambda item: item_supports.get(item, min_support)
+    item_counts = {}
+    for transaction, count in data.items():
+        for item in transaction:
+            item_counts[item] = item_counts.get(item, 0) + count
+    ranked = sorted(item_counts, key=lambda item: (-mis(item), -item_counts[item], str(item)))
+    item_rank = {item: rank for rank, item in enumerate(ranked)}
+    frequent_itemsets = ItemsetTrie('q')
+    candidates = [item for item in ranked if item not in excluded and item_counts[item] >= mis(item)]
+    if not candidates or not required.issubset(item_counts):
+        return frequent_itemsets
+    tree, header_table = construct_fp_tree(data, min(mis(item) for item in candidates), excluded, item_rank)
+    if checkpoint_dir is not None:
+        mine_tree_with_checkpoint({item: header_table[item] for item in candidates}, min_support, frequent_itemsets,
+                                  checkpoint_dir, data_checksum(data), min_length, max_length, required, item_supports)
+    else:
+        for item in candidates:
+            mine_tree({item: header_table[item]}, mis(item), set(), frequent_itemsets, min_length, max_length, required,
+                      support)
+    if support is not None:
+        fill_missing_support(data, frequent_itemsets, support)
+    return frequent_itemsets
+
+def data_checksum(data):
+    # crc32 of a {transaction: count} dict, whatever the order of its entries
+    # and of the items within a transaction.
+    checksum = 0
+    for line in sorted('\x1f'.join(sorted(map(str, transaction))) + '\x1d' + str(count) for transaction, count in data.items()):
+        checksum = zlib.crc32(line.encode() + b'\x1e', checksum)
+    return checksum
+
+def mine_tree_with_checkpoint(header_table, min_support, frequent_itemsets, checkpoint_dir, checksum, min_length=1, max_length=None, required=frozenset(), item_supports=None):
+    # checkpoint_dir holds the run parameters in meta.json, checksum of the
+    # data included, and one ItemsetTrie per finished top-level header item,
+    # item_<i>.npz for the i-th item in mining order. A rerun loads those and
+    # only mines the remaining header items. With item_supports (CFP-Growth)
+    # each header item is mined at its own minimum support, min_support for
+    # the items not in it.
+    params = {'min_support': min_support, 'min_length': min_length, 'max_length': max_length,
+              'required': sorted(map(str, required)),
+              'item_supports': None if item_supports is None else sorted([str(k), v] for k, v in item_supports.items()),
+              'header': sorted([str(item), entry[0]] for item, entry in header_table.items()),
+              'checksum': checksum}
+    meta_path = os.path.join(checkpoint_dir, 'meta.json')
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            if json.load(f) != params:
+                raise ValueError(f"checkpoint in {checkpoint_dir} was written for a different dataset or parameters")
+    else:
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        with open(meta_path, 'w') as f:
+            json.dump(params, f)
+    order = sorted(header_table.items(), key=lambda p: (p[1][0], str(p[0])))
+    for i, (item, entry) in enumerate(order):
+        path = os.path.join(checkpoint_dir, 'item_%d' % i)
+        if os.path.exists(path + '.npz'):
+            frequent_itemsets.update(ItemsetTrie.load(path + '.npz').items())
+            continue
+        found = ItemsetTrie('q')
+        support = min_support if item_supports is None else item_supports.get(item, min_support)
+        mine_tree({item: entry}, support, set(), found, min_length, max_length, required)
+        frequent_itemsets.update(found.items())
+        # Written under a temporary name first so a crash never leaves a half item.
+        found.save(path + '.tmp.npz')
+        os.replace(path + '.tmp.npz', path + '.npz')
+
+def iter_fp_growth(data, min_support, min_length=1, max_length=None, required=frozenset(), excluded=frozenset()):
+    tree, header_table = construct_fp_tree(data, min_support, excluded)
+    if required.issubset(header_table):
+        yield from iter_mine_tree(header_table, min_support, set(), min_length, max_length, required)
+
 def convert_to_freq_dict(transactions):
     freq_dict = {}
     for transaction in transactions:
@@ -102,37 +292,43 @@ def read_transactions_from_csv(file_path):
         print("File not found. Please provide a valid file path.")
         return None
 
-def load_transactions(dataList):
-    Transactions = []
-    df_items = dataList['TransactionList']
-    comma_splitted_df = df_items.apply(lambda x: x.split(','))
-    for i in comma_splitted_df:
-        Transactions.append(i)
-    return Transactions
-
-def generate_association_rules(frequent_itemsets, min_confidence):
+def generate_association_rules(frequent_itemsets, min_confidence, support=None):
+    # support holds the antecedent supports when frequent_itemsets was
+    # filtered by constraints (see fp_growth); by default they are looked up
+    # in frequent_itemsets itself.
+    if support is None:
+        support = frequent_itemsets
     association_rules = []
     for itemset in frequent_itemsets.keys():
         if len(itemset) > 1:
-            rules_from_itemset = generate_rules_from_itemset(itemset, frequent_itemsets, min_confidence)
+            rules_from_itemset = generate_rules_from_itemset(itemset, frequent_itemsets, min_confidence, support)
             association_rules.extend(rules_from_itemset)
     return association_rules
 
-def generate_rules_from_itemset(itemset, frequent_itemsets, min_confidence):
+def generate_rules_from_itemset(itemset, frequent_itemsets, min_confidence, support=None):
+    if support is None:
+        support = frequent_itemsets
     rules = []
-    subsets = get_subsets(itemset)
-    for subset in subsets:
-        remaining = tuple(set(itemset).difference(subset))
-        confidence = frequent_itemsets[itemset] / frequent_itemsets[subset]
+    itemset_support = frequent_itemsets[itemset]
+    for subset, subset_support in support.subsets(itemset):
+        if len(subset) == len(itemset):
+            continue
+        remaining = tuple(sorted(set(itemset).difference(subset)))
+        confidence = itemset_support / subset_support
         if confidence >= min_confidence:
             rules.append((subset, remaining, confidence))
     return rules
 
-def get_subsets(itemset):
-    subsets = []
-    for i in range(1, len(itemset)):
-        subsets.extend(combinations(itemset, i))
-    return subsets
+def parse_items(text):
+    return frozenset(item.strip() for item in text.split(',') if item.strip())
+
+def parse_item_supports(text):
+    item_supports = {}
+    for pair in text.split(','):
+        if pair.strip():
+            item, value = pair.rsplit(':', 1)
+            item_supports[item.strip()] = float(value) / 100
+    return item_supports or None
 
 if __name__ == '__main__':
     print("Welcome to the FP-Growth algorithm.")
@@ -175,13 +371,23 @@ if __name__ == '__main__':
 
     minsupport = float(input("Enter the Minimum Support (in percentage): ")) / 100
     minconfidence = float(input("Enter the Minimum Confidence (in percentage): ")) / 100
+    min_length = int(input("Enter the Minimum Itemset Length (leave blank for 1): ") or 1)
+    max_length = int(input("Enter the Maximum Itemset Length (leave blank for no limit): ") or 0) or None
+    required = parse_items(input("Enter items every itemset must contain (comma separated, leave blank for none): "))
+    excluded = parse_items(input("Enter items to exclude (comma separated, leave blank for none): "))
+    checkpoint_dir = input("Enter a checkpoint directory to save progress to or resume from (leave blank for none): ") or None
+    item_supports = parse_item_supports(input("Enter item minimum supports as item:percentage pairs (comma separated, leave blank for none): "))
 
     Transactions = load_transactions(dataList)
     data = convert_to_freq_dict(Transactions)
 
     start_time = time.time()
-    frequent_itemsets = fp_growth(data, minsupport)
-    association_rules = generate_association_rules(frequent_itemsets, minconfidence)
+    # The tree works on absolute counts, the prompts ask for percentages.
+    if item_supports is not None:
+        item_supports = {item: value * len(Transactions) for item, value in item_supports.items()}
+    support = ItemsetTrie('q')
+    frequent_itemsets = fp_growth(data, minsupport * len(Transactions), min_length, max_length, required, excluded, checkpoint_dir, item_supports, support)
+    association_rules = generate_association_rules(frequent_itemsets, minconfidence, support)
     end_time = time.time()
 
     print("\nFrequent itemsets found with FP-Growth algorithm:")
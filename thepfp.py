@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import time
+import socket
+import multiprocessing
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, wait, deliver_challenge, answer_challenge
+
+from thefp import (read_transactions_from_csv, load_transactions, convert_to_freq_dict, construct_fp_tree,
+                   mine_tree, generate_association_rules)
+from itemset_trie import ItemsetTrie
+from shared_dataset import SharedDataset
+
+# Seconds between checks on the workers while waiting for them to connect or exit.
+ACCEPT_POLL = 1.0
+# Baskets from which the CLI shares the dataset with local workers instead of
+# sharding a {transaction: count} dict in this process. The dict path was still
+# faster at 300k baskets (0.85-1.04 s against 1.69 s); the shared one saves
+# the parent from holding the decoded baskets and every shard.
+SHARED_MIN_BASKETS = 1000000
+
+
+class ProcessTransport:
+    # Runs the group tasks on a local process pool.
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count()
+
+    def map(self, func, tasks):
+        with multiprocessing.Pool(self.workers) as pool:
+            return pool.map(func, tasks)
+
+
+class SocketTransport:
+    # Hands the group tasks to workers connected over sockets. With spawn_local
+    # the workers are started as local processes; otherwise start
+    # `python thepfp.py worker HOST PORT AUTHKEY` on each node once the
+    # address is bound. Results are unpickled, so remote workers must share a
+    # secret authkey with the driver; spawned workers get a random one. Waiting
+    # for workers gives up after accept_timeout seconds (None waits for remote
+    # workers indefinitely), and as soon as a spawned worker exits before
+    # connecting.
+    def __init__(self, address=('127.0.0.1', 0), authkey=None, workers=2, spawn_local=True, accept_timeout=None):
+        if authkey is None:
+            if not spawn_local:
+                raise ValueError("remote workers need a secret authkey")
+            authkey = os.urandom(32)
+        self.address = address
+        self.authkey = authkey
+        self.workers = workers
+        self.spawn_local = spawn_local
+        self.accept_timeout = accept_timeout
+
+    def map(self, func, tasks):
+        results = [None] * len(tasks)
+        pending = list(enumerate(tasks))
+        pending.reverse()
+        # A plain listening socket with a timeout instead of a Listener, so that
+        # accept() wakes up to check on the workers; accepted connections block
+        # and authenticate as Listener.accept() would.
+        server = socket.create_server(self.address)
+        server.settimeout(ACCEPT_POLL)
+        address = server.getsockname()[:2]
+        processes = []
+        connections = []
+        try:
+            if self.spawn_local:
+                for _ in range(self.workers):
+                    process = multiprocessing.Process(target=worker_loop, args=(address, self.authkey))
+                    process.start()
+                    processes.append(process)
+            else:
+                print(f"Waiting for {self.workers} workers on {address[0]}:{address[1]}")
+            deadline = None if self.accept_timeout is None else time.monotonic() + self.accept_timeout
+            while len(connections) < self.workers:
+                try:
+                    client, _ = server.accept()
+                except socket.timeout:
+                    if any(process.exitcode is not None for process in processes):
+                        raise RuntimeError("a PFP worker exited before connecting")
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise TimeoutError(f"{len(connections)} of {self.workers} PFP workers connected "
+                                           f"within {self.accept_timeout}s")
+                    continue
+                client.setblocking(True)
+                conn = Connection(client.detach())
+                try:
+                    deliver_challenge(conn, self.authkey)
+                    answer_challenge(conn, self.authkey)
+                except (AuthenticationError, EOFError, OSError):
+                    # A client with another key is turned away; keep waiting.
+                    conn.close()
+                    continue
+                connections.append(conn)
+            busy = {}
+            for conn in connections:
+                if pending:
+                    index, task = pending.pop()
+                    conn.send((func, task))
+                    busy[conn] = index
+            while busy:
+                for conn in wait(list(busy)):
+                    index = busy.pop(conn)
+                    try:
+                        ok, result = conn.recv()
+                    except (EOFError, OSError):
+                        raise RuntimeError(f"a PFP worker exited while running task {index}") from None
+                    if not ok:
+                        raise result
+                    results[index] = result
+                    if pending:
+                        index, task = pending.pop()
+                        conn.send((func, task))
+                        busy[conn] = index
+            for conn in connections:
+                conn.send(None)
+        finally:
+            for conn in connections:
+                conn.close()
+            server.close()
+            for process in processes:
+                process.join(ACCEPT_POLL)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+        return results
+
+
+def worker_loop(address, authkey):
+    # Replies (True, result) per task, or (False, exception) when it raised.
+    # Stops on None, or when the driver closes the connection.
+    conn = Client(address, authkey=authkey)
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        except Exception as error:
+            # The task did not unpickle here, e.g. its function is missing.
+            conn.send((False, error))
+            continue
+        if message is None:
+            break
+        func, task = message
+        try:
+            reply = (True, func(task))
+        except Exception as error:
+            reply = (False, error)
+        conn.send(reply)
+    conn.close()
+
+
+def group_items(item_counts, num_groups):
+    # Frequent items ranked by descending count, dealt round-robin into groups
+    # so every group gets a mix of frequent and rare items.
+    ranked = sorted(item_counts, key=lambda item: (-item_counts[item], str(item)))
+    item_rank = {item: rank for rank, item in enumerate(ranked)}
+    group_of = {item: rank % num_groups for rank, item in enumerate(ranked)}
+    return item_rank, group_of
+
+def shard_transactions(data, item_rank, group_of, num_groups):
+    # For every group in a transaction, its shard receives the transaction
+    # prefix up to the group's last item in rank order.
+    shards = [{} for _ in range(num_groups)]
+    for transaction, count in data.items():
+        items = sorted((item for item in set(transaction) if item in item_rank), key=lambda item: item_rank[item])
+        sent = set()
+        for pos in range(len(items) - 1, -1, -1):
+            group = group_of[items[pos]]
+            if group in sent:
+                continue
+            sent.add(group)
+            prefix = tuple(items[:pos + 1])
+            shards[group][prefix] = shards[group].get(prefix, 0) + count
+    return shards
+
+def shard_range(task):
+    # Map step for a SharedDataset: the shards of every group from one
+    # contiguous range of baskets.
+    handle, start, stop, item_rank, group_of, num_groups = task
+    dataset = SharedDataset.attach(handle)
+    try:
+        data = {}
+        for transaction in dataset.decode(start, stop):
+            transaction = tuple(transaction)
+            data[transaction] = data.get(transaction, 0) + 1
+    finally:
+        dataset.close()
+    return shard_transactions(data, item_rank, group_of, num_groups)
+
+def mine_group(task):
+    # Builds the shard's FP-tree in the global item order and mines only the
+    # group's items at the top level, i.e. the itemsets whose last item in
+    # that order belongs to the group. Their shard counts are global counts.
+    items, shard, min_support, item_rank = task
+    tree, header_table = construct_fp_tree(shard, min_support, item_rank=item_rank)
+    header_table = {item: header_table[item] for item in items if item in header_table}
+    frequent_itemsets = {}
+    mine_tree(header_table, min_support, set(), frequent_itemsets)
+    return frequent_itemsets
+
+def pfp_growth(data, min_support, num_groups=None, transport=None):
+    # data is a {transaction: count} dict, or a SharedDataset whose baskets
+    # count once each. The dict is sharded here; a SharedDataset is sharded by
+    # the workers, each attaching to it and sharding one range of baskets for
+    # every group, so those workers must run on this machine. Either way the
+    # shards of a group are then mined by one worker.
+    if transport is None:
+        transport = ProcessTransport()
+    if num_groups is None:
+        num_groups = getattr(transport, 'workers', 1) * 2
+    shared = isinstance(data, SharedDataset)
+    if shared:
+        item_counts = data.item_counts()
+    else:
+        item_counts = {}
+        for transaction, count in data.items():
+            for item in set(transaction):
+                item_counts[item] = item_counts.get(item, 0) + count
+    item_counts = {k: v for k, v in item_counts.items() if v >= min_support}
+    item_rank, group_of = group_items(item_counts, num_groups)
+    if shared:
+        chunk = max(-(-len(data) // getattr(transport, 'workers', 1)), 1)
+        ranges = [(data.handle, start, min(start + chunk, len(data)), item_rank, group_of, num_groups)
+                  for start in range(0, len(data), chunk)]
+        shards = [{} for _ in range(num_groups)]
+        for range_shards in transport.map(shard_range, ranges):
+            for shard, range_shard in zip(shards, range_shards):
+                for prefix, count in range_shard.items():
+                    shard[prefix] = shard.get(prefix, 0) + count
+    else:
+        shards = shard_transactions(data, item_rank, group_of, num_groups)
+    tasks = []
+    for group in range(num_groups):
+        if shards[group]:
+            items = [item for item in item_rank if group_of[item] == group]
+            tasks.append((items, shards[group], min_support, item_rank))
+    frequent_itemsets = ItemsetTrie('q')
+    for result in transport.map(mine_group, tasks):
+        frequent_itemsets.update(result)
+    return frequent_itemsets
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'worker':
+        if len(sys.argv) != 5 or not sys.argv[4]:
+            print("Usage: python thepfp.py worker HOST PORT AUTHKEY")
+            sys.exit(2)
+        worker_loop((sys.argv[2], int(sys.argv[3])), sys.argv[4].encode())
+        sys.exit(0)
+
+    print("Welcome to the Parallel FP-Growth algorithm.")
+    print("Please choose the dataset you want:")
+
+    datasets = {
+        '1': 'Nike.csv',
+        '2': 'Kmart - Sheet1.csv',
+        '3': 'Cars_List.csv',
+        '4': 'Games_Transaction_List.csv',
+        '5': 'Costco.csv'
+    }
+
+    while True:
+        choice_of_data = input("Enter your choice: ")
+        if choice_of_data in datasets:
+            file_path = datasets[choice_of_data]
+            print(f"User chose {file_path} dataset")
+            break
+        else:
+            print("Invalid choice. Please enter the number corresponding to the dataset.")
+
+    dataList = read_transactions_from_csv(file_path)
+    if dataList is None:
+        sys.exit(1)
+
+    minsupport = float(input("Enter the Minimum Support (in percentage): ")) / 100
+    minconfidence = float(input("Enter the Minimum Confidence (in percentage): ")) / 100
+    workers = int(input("Enter the number of workers: ") or os.cpu_count())
+    backend = input("Enter the backend (1. local processes, 2. local socket workers, 3. remote socket workers): ")
+    if backend == '2':
+        transport = SocketTransport(workers=workers)
+    elif backend == '3':
+        host = input("Enter the address to listen on (leave blank for 127.0.0.1): ") or '127.0.0.1'
+        port = int(input("Enter the port to listen on: "))
+        authkey = ''
+        while not authkey:
+            authkey = input("Enter the secret key shared with the workers: ")
+        authkey = authkey.encode()
+        transport = SocketTransport((host, port), authkey, workers, spawn_local=False)
+    else:
+        transport = ProcessTransport(workers)
+
+    if backend not in ('2', '3') and len(dataList) >= SHARED_MIN_BASKETS:
+        # Local workers attach to the baskets in shared memory.
+        data = Transactions = SharedDataset.from_dataframe(dataList, workers)
+    else:
+        Transactions = load_transactions(dataList)
+        data = convert_to_freq_dict(Transactions)
+
+    start_time = time.time()
+    frequent_itemsets = pfp_growth(data, minsupport * len(Transactions), transport=transport)
+    association_rules = generate_association_rules(frequent_itemsets, minconfidence)
+    end_time = time.time()
+    if isinstance(data, SharedDataset):
+        data.close()
+
+    print("\nFrequent itemsets found with Parallel FP-Growth algorithm:")
+    for itemset, support in frequent_itemsets.items():
+        print(f"Itemset: {itemset}, Support: {support}")
+
+    print("\nAssociation rules found with Parallel FP-Growth algorithm:")
+    for rule in association_rules:
+        antecedent = ', '.join(rule[0])
+        consequent = ', '.join(rule[1])
+        confidence = rule[2]
+        print(f"Rule: {antecedent} -> {consequent}, Confidence: {confidence}")
+
+    print("-------------------------- RUNNING TIME:------------------------------------")
+    print("The Runtime of the program is: " + str(end_time - start_time) + "seconds")
+
+    print("---------------------------------------------------------------------------\n")
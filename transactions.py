@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_columns(dataList):
+    # Headers differ between the datasets ('TransactionID', 'Transaction ID ').
+    dataList = dataList.copy(deep=False)
+    dataList.columns = dataList.columns.str.replace(r'\s+', '', regex=True)
+    return dataList
+
+def encode_transactions(dataList):
+    # Tokenizes the TransactionList column in bulk and dictionary-encodes the
+    # items. Whitespace around items is stripped, empty items are dropped and an
+    # item repeated within a basket is kept once. Returns CSR-style arrays:
+    # basket i holds item ids item_ids[offsets[i]:offsets[i + 1]] (in order of
+    # first appearance) and items[id] is the item name.
+    baskets = normalize_columns(dataList)['TransactionList'].fillna('').astype(str).tolist()
+    if not baskets:
+        return np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.empty(0, dtype=object)
+    lengths = np.fromiter((basket.count(',') + 1 for basket in baskets), dtype=np.int64, count=len(baskets))
+    tokens = ','.join(baskets).split(',')
+    # Strip the distinct raw tokens only, then merge the ones that become equal.
+    raw_ids, raw_items = pd.factorize(np.asarray(tokens, dtype=object))
+    stripped_ids, items = pd.factorize(pd.Index(raw_items, dtype=object).str.strip())
+    item_ids = stripped_ids[raw_ids]
+    rows = np.repeat(np.arange(len(baskets), dtype=np.int64), lengths)
+    items = np.asarray(items, dtype=object)
+    if (items == '').any():
+        valid = items != ''
+        keep = valid[item_ids]
+        rows, item_ids = rows[keep], (np.cumsum(valid) - 1)[item_ids[keep]]
+        items = items[valid]
+    _, first = np.unique(rows * max(len(items), 1) + item_ids, return_index=True)
+    first.sort()
+    rows, item_ids = rows[first], item_ids[first]
+    offsets = np.zeros(len(baskets) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(baskets)), out=offsets[1:])
+    return offsets, item_ids.astype(np.int32), items
+
+def encode_baskets(transactions):
+    # encode_transactions for baskets that are already lists of items.
+    baskets = [list(dict.fromkeys(transaction)) for transaction in transactions]
+    ids = {}
+    item_ids = np.fromiter((ids.setdefault(item, len(ids)) for basket in baskets for item in basket), dtype=np.int32)
+    offsets = np.zeros(len(baskets) + 1, dtype=np.int64)
+    np.cumsum([len(basket) for basket in baskets], out=offsets[1:])
+    items = np.empty(len(ids), dtype=object)
+    items[:] = list(ids)
+    return offsets, item_ids, items
+
+def decode_transactions(offsets, item_ids, items):
+    names = items[item_ids].tolist()
+    bounds = offsets.tolist()
+    return [names[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+def load_transactions(dataList):
+    return decode_transactions(*encode_transactions(dataList))